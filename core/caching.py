@@ -0,0 +1,41 @@
+import time
+from django.core.cache import cache
+from django.utils import timezone
+
+HOME_EVENTS_VERSION_KEY = 'home-events-version'
+
+
+# ----------------------------
+# Versioned keys
+# ----------------------------
+def get_version(key):
+    """The version stored under ``key``, creating it if it is missing."""
+    version = cache.get(key)
+    if version is None:
+        # A fresh, unique version so entries written before an eviction are never reused.
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_versions(*keys):
+    """Give every key a new version, orphaning whatever was cached under the old ones."""
+    # One round trip however many keys: a new time_ns() never matches a version handed out earlier.
+    if keys:
+        cache.set_many(dict.fromkeys(keys, time.time_ns()), None)
+
+
+# ----------------------------
+# Home page
+# ----------------------------
+def home_events_cache_key():
+    """
+    Vary part of the home page's cached card section. The version changes
+    whenever an event or category changes; the date makes "upcoming" roll
+    over at midnight.
+    """
+    return f'{get_version(HOME_EVENTS_VERSION_KEY)}:{timezone.localdate().isoformat()}'
+
+
+def invalidate_home_events():
+    bump_versions(HOME_EVENTS_VERSION_KEY)
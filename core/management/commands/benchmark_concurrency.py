@@ -0,0 +1,157 @@
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from itertools import cycle
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import AsyncClient, Client
+
+DEFAULT_PATHS = ['/', '/events/']
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare request throughput of the WSGI handler (sync views, a fixed pool of worker threads) "
+        "with the ASGI handler (async views on one event loop) at high concurrency. "
+        "Runs in-process against the configured database; seed it first with seed_data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=['both', 'wsgi', 'asgi'], default='both')
+        parser.add_argument('--concurrency', type=int, default=100, help="Simultaneous clients.")
+        parser.add_argument('--requests', type=int, default=2000, help="Total requests per mode.")
+        parser.add_argument('--threads', type=int, default=8,
+                            help="WSGI worker threads, as in gunicorn --threads.")
+        parser.add_argument('--path', action='append', dest='paths',
+                            help=f"URL to request (repeatable). Default: {' '.join(DEFAULT_PATHS)}")
+        parser.add_argument('--user', help="Username to log the clients in as (needed for dashboards).")
+        parser.add_argument('--json', action='store_true', help="Print one mode's result as JSON.")
+
+    def handle(self, *args, **options):
+        options['paths'] = options['paths'] or DEFAULT_PATHS
+        if options['mode'] == 'both':
+            return self.compare(options)
+
+        expected_async = options['mode'] == 'asgi'
+        if settings.ASYNC_VIEWS != expected_async:
+            raise CommandError(f"--mode {options['mode']} needs ASYNC_VIEWS={expected_async}.")
+        user = User.objects.get(username=options['user']) if options['user'] else None
+        runner = self.run_asgi if expected_async else self.run_wsgi
+        result = runner(options, user)
+        if options['json']:
+            self.stdout.write(json.dumps(result))
+        else:
+            self.print_table([result])
+
+    # ----------------------------
+    # Each mode in its own process, since ASYNC_VIEWS is read at URLconf import
+    # ----------------------------
+    def compare(self, options):
+        results = []
+        for mode, async_views in (('wsgi', 'False'), ('asgi', 'True')):
+            command = [
+                sys.executable, sys.argv[0], 'benchmark_concurrency', '--mode', mode, '--json',
+                '--concurrency', str(options['concurrency']), '--requests', str(options['requests']),
+                '--threads', str(options['threads']),
+            ]
+            for path in options['paths']:
+                command += ['--path', path]
+            if options['user']:
+                command += ['--user', options['user']]
+            self.stdout.write(f"Running {mode}...")
+            child = subprocess.run(
+                command, env={**os.environ, 'ASYNC_VIEWS': async_views}, capture_output=True, text=True,
+            )
+            if child.returncode:
+                raise CommandError(f"{mode} run failed:\n{child.stderr}")
+            results.append(json.loads(child.stdout.strip().splitlines()[-1]))
+        self.print_table(results)
+        wsgi, asgi = results
+        self.stdout.write(f"ASGI/WSGI throughput: {asgi['rps'] / wsgi['rps']:.2f}x")
+
+    def print_table(self, results):
+        self.stdout.write(f"{'mode':<6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+        for r in results:
+            self.stdout.write(f"{r['mode']:<6}{r['rps']:>10.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['errors']:>8}")
+
+    def summarize(self, mode, latencies, errors, elapsed):
+        ordered = sorted(latencies)
+        return {
+            'mode': mode,
+            'requests': len(latencies),
+            'rps': len(latencies) / elapsed,
+            'p50_ms': statistics.median(ordered) * 1000,
+            'p95_ms': ordered[int(len(ordered) * 0.95) - 1] * 1000,
+            'errors': errors,
+        }
+
+    # ----------------------------
+    # WSGI: one thread per client, at most --threads inside the handler at once
+    # ----------------------------
+    def run_wsgi(self, options, user):
+        workers = threading.BoundedSemaphore(options['threads'])
+        per_client = max(1, options['requests'] // options['concurrency'])
+        latencies, errors = [], []
+        lock = threading.Lock()
+
+        def client_loop():
+            client = Client()
+            if user:
+                client.force_login(user)
+            paths = cycle(options['paths'])
+            mine, failed = [], 0
+            for _ in range(per_client):
+                started = time.perf_counter()
+                # Waiting for a free worker thread is part of the latency a client sees.
+                with workers:
+                    response = client.get(next(paths))
+                mine.append(time.perf_counter() - started)
+                failed += response.status_code >= 400
+            connections.close_all()
+            with lock:
+                latencies.extend(mine)
+                errors.append(failed)
+
+        threads = [threading.Thread(target=client_loop) for _ in range(options['concurrency'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.summarize('wsgi', latencies, sum(errors), time.perf_counter() - started)
+
+    # ----------------------------
+    # ASGI: every client is a task on one event loop
+    # ----------------------------
+    def run_asgi(self, options, user):
+        per_client = max(1, options['requests'] // options['concurrency'])
+
+        async def client_loop():
+            client = AsyncClient()
+            if user:
+                await client.aforce_login(user)
+            paths = cycle(options['paths'])
+            mine, failed = [], 0
+            for _ in range(per_client):
+                started = time.perf_counter()
+                response = await client.get(next(paths))
+                mine.append(time.perf_counter() - started)
+                failed += response.status_code >= 400
+            return mine, failed
+
+        async def run():
+            started = time.perf_counter()
+            outcomes = await asyncio.gather(*(client_loop() for _ in range(options['concurrency'])))
+            return outcomes, time.perf_counter() - started
+
+        outcomes, elapsed = asyncio.run(run())
+        latencies = [latency for mine, _ in outcomes for latency in mine]
+        return self.summarize('asgi', latencies, sum(failed for _, failed in outcomes), elapsed)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.models import PlatformStats
+
+
+class Command(BaseCommand):
+    help = "Recount the admin dashboard's platform stats snapshot from scratch."
+
+    def handle(self, *args, **options):
+        stats = PlatformStats.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Organizers: {stats.total_organizers}, participants: {stats.total_participants}, "
+            f"events: {stats.total_events}, past events: {stats.total_past_events}"
+        ))
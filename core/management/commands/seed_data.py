@@ -0,0 +1,140 @@
+import random
+import time
+from datetime import date, time as clock_time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.caching import invalidate_home_events
+from core.models import PlatformStats
+from events import search
+from events.models import Category, Event, RSVP
+from users.directory import rebuild_directory
+from users.roles import ADMIN, ORGANIZER, PARTICIPANT
+
+CATEGORIES = ['Technology', 'Health', 'Business', 'Art', 'Sports', 'Music', 'Education', 'Food']
+FIRST_NAMES = ['Amina', 'Rahim', 'Karim', 'Nadia', 'Sara', 'Tanvir', 'Farhan', 'Lamia', 'Imran', 'Sadia',
+               'John', 'Maria', 'Wei', 'Priya', 'Omar', 'Elena', 'Kenji', 'Fatima', 'Lucas', 'Zara']
+LAST_NAMES = ['Rahman', 'Hossain', 'Islam', 'Ahmed', 'Khan', 'Chowdhury', 'Smith', 'Garcia', 'Chen',
+              'Patel', 'Ali', 'Novak', 'Tanaka', 'Silva', 'Haque', 'Begum', 'Das', 'Roy', 'Lee', 'Kim']
+ADJECTIVES = ['Annual', 'Global', 'Open', 'Future', 'Creative', 'Digital', 'Community', 'Summer', 'Winter', 'Grand']
+TOPICS = ['Summit', 'Meetup', 'Workshop', 'Festival', 'Conference', 'Hackathon', 'Expo', 'Bootcamp', 'Forum', 'Gala']
+CITIES = ['Dhaka', 'Chittagong', 'Sylhet', 'Khulna', 'Rajshahi', 'Barisal', 'Rangpur', 'Comilla']
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a reproducible synthetic dataset (users, organizers, events, RSVPs) "
+        "with bulk inserts. The same --seed always produces the same data; run it on an empty database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--participants', type=int, default=1000)
+        parser.add_argument('--organizers', type=int, default=50)
+        parser.add_argument('--events', type=int, default=500)
+        parser.add_argument('--rsvps-per-event', type=int, default=20, help="Average; actual counts vary 0..2x.")
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--password', default='pass1234', help="Password shared by every generated user.")
+        parser.add_argument('--base-date', type=date.fromisoformat, default=date(2026, 1, 1),
+                            help="Events are spread one year either side of this date.")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        started = time.perf_counter()
+
+        # Hash once; PBKDF2 per user would dominate the run time.
+        self.password_hash = make_password(options['password'], salt=f"seed{options['seed']}")
+
+        groups = {name: Group.objects.get_or_create(name=name)[0] for name in (ADMIN, ORGANIZER, PARTICIPANT)}
+        categories = [Category.objects.get_or_create(name=name)[0].pk for name in CATEGORIES]
+
+        admin_ids = self.create_users('admin', 1, is_superuser=True, is_staff=True)
+        organizer_ids = self.create_users('organizer', options['organizers'])
+        participant_ids = self.create_users('participant', options['participants'])
+        self.add_to_group(groups[ADMIN], admin_ids)
+        self.add_to_group(groups[ORGANIZER], organizer_ids)
+        self.add_to_group(groups[PARTICIPANT], participant_ids)
+        self.log(f"{len(admin_ids) + len(organizer_ids) + len(participant_ids)} users", started)
+
+        event_ids = self.create_events(options['events'], organizer_ids, categories, options['base_date'])
+        self.log(f"{len(event_ids)} events", started)
+
+        rsvps = self.create_rsvps(event_ids, participant_ids, options['rsvps_per_event'])
+        self.log(f"{rsvps} RSVPs", started)
+
+        # Bulk inserts bypass the signal handlers; rebuild derived data once instead.
+        with transaction.atomic():
+            search.rebuild_index()
+        PlatformStats.rebuild()
+        rebuild_directory()
+        invalidate_home_events()
+        self.log("search index, stats and user directory rebuilt", started)
+        self.stdout.write(self.style.SUCCESS("Seed data generated."))
+
+    def log(self, message, started):
+        self.stdout.write(f"[{time.perf_counter() - started:7.1f}s] {message}")
+
+    def create_users(self, prefix, count, **flags):
+        ids = []
+        for offset in range(0, count, self.batch_size):
+            batch = []
+            for n in range(offset, min(offset + self.batch_size, count)):
+                first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+                username = f'{prefix}{n:07d}'
+                batch.append(User(
+                    username=username, email=f'{username}@example.com', password=self.password_hash,
+                    first_name=first, last_name=last, is_active=True, **flags,
+                ))
+            ids.extend(user.pk for user in User.objects.bulk_create(batch))
+        return ids
+
+    def add_to_group(self, group, user_ids):
+        # Through-table rows directly: no m2m_changed per user.
+        Membership = User.groups.through
+        for offset in range(0, len(user_ids), self.batch_size):
+            Membership.objects.bulk_create(
+                [Membership(user_id=uid, group_id=group.pk) for uid in user_ids[offset:offset + self.batch_size]]
+            )
+
+    def create_events(self, count, organizer_ids, categories, base_date):
+        ids = []
+        for offset in range(0, count, self.batch_size):
+            batch = []
+            for _ in range(offset, min(offset + self.batch_size, count)):
+                event = Event(
+                    name=f'{self.rng.choice(ADJECTIVES)} {self.rng.choice(CATEGORIES)} {self.rng.choice(TOPICS)}',
+                    description='Generated event for load testing.',
+                    date=base_date + timedelta(days=self.rng.randint(-365, 365)),
+                    time=clock_time(self.rng.randint(8, 21), self.rng.choice([0, 15, 30, 45])),
+                    location=self.rng.choice(CITIES),
+                    category_id=self.rng.choice(categories),
+                    organizer_id=self.rng.choice(organizer_ids),
+                )
+                # Most events get an end time of one to eight hours later.
+                if self.rng.random() < 0.8:
+                    event.end_at = event.compute_start_at() + timedelta(hours=self.rng.randint(1, 8))
+                batch.append(event)
+            ids.extend(event.pk for event in Event.objects.bulk_create(batch))
+        return ids
+
+    def create_rsvps(self, event_ids, participant_ids, average):
+        if not participant_ids:
+            return 0
+        total = 0
+        batch = []
+        for event_id in event_ids:
+            k = min(self.rng.randint(0, 2 * average), len(participant_ids))
+            batch.extend(RSVP(user_id=uid, event_id=event_id) for uid in self.rng.sample(participant_ids, k))
+            if len(batch) >= self.batch_size:
+                # RSVP.objects.bulk_create also resyncs rsvp_count for the touched events.
+                RSVP.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            RSVP.objects.bulk_create(batch)
+            total += len(batch)
+        return total
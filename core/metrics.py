@@ -0,0 +1,130 @@
+"""
+In-process request metrics, rendered in the Prometheus text format.
+
+Each worker process keeps its own registry, so a scraper sees per-process
+numbers; aggregate across processes on the Prometheus side. Everything here
+is guarded by one lock because the dev server and threaded WSGI servers
+update it from several threads at once.
+"""
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+_lock = threading.Lock()
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series = {}
+
+    def observe(self, labels, value):
+        with _lock:
+            counts, total = self.series.get(labels, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect_left(self.buckets, value)] += 1
+            self.series[labels] = (counts, total + value)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with _lock:
+            series = sorted((labels, list(counts), total) for labels, (counts, total) in self.series.items())
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_labels(labels, le=bound)} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(labels)} {total}')
+            lines.append(f'{self.name}_count{_labels(labels)} {cumulative}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self.series = defaultdict(int)
+
+    def inc(self, labels=(), amount=1):
+        with _lock:
+            self.series[labels] += amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with _lock:
+            series = sorted(self.series.items())
+        lines.extend(f'{self.name}{_labels(labels)} {value}' for labels, value in series)
+        return lines
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+# ----------------------------
+# Registry
+# ----------------------------
+request_latency = Histogram(
+    'http_request_duration_seconds', 'Time spent handling a request, by URL name.', LATENCY_BUCKETS)
+request_queries = Histogram(
+    'http_request_db_queries', 'SQL statements executed per request, by URL name.', QUERY_BUCKETS)
+request_db_time = Histogram(
+    'http_request_db_duration_seconds', 'Time spent in the database per request, by URL name.', LATENCY_BUCKETS)
+responses = Counter('http_responses_total', 'Responses sent, by URL name and status code.')
+cache_lookups = Counter('cache_lookups_total', 'Application cache lookups, by cache and result.')
+db_connections = Counter(
+    'db_connections_total', 'Database connections opened, and requests served on an already-open one.')
+
+
+def record_request(view, latency, queries, db_time, status):
+    labels = (('view', view),)
+    request_latency.observe(labels, latency)
+    request_queries.observe(labels, queries)
+    request_db_time.observe(labels, db_time)
+    responses.inc((('view', view), ('status', status)))
+
+
+def record_cache(name, hit):
+    cache_lookups.inc((('cache', name), ('result', 'hit' if hit else 'miss')))
+
+
+def record_connection(reused):
+    db_connections.inc((('state', 'reused' if reused else 'opened'),))
+
+
+def _cache_hit_ratios():
+    lines = ['# HELP cache_hit_ratio Share of application cache lookups that hit.', '# TYPE cache_hit_ratio gauge']
+    with _lock:
+        totals = defaultdict(lambda: [0, 0])
+        for labels, value in cache_lookups.series.items():
+            label_map = dict(labels)
+            totals[label_map['cache']][label_map['result'] == 'hit'] += value
+    for name, (misses, hits) in sorted(totals.items()):
+        lines.append(f'cache_hit_ratio{_labels((("cache", name),))} {hits / (hits + misses):.4f}')
+    return lines
+
+
+def render():
+    lines = []
+    for metric in (request_latency, request_queries, request_db_time, responses, cache_lookups, db_connections):
+        lines.extend(metric.render())
+    lines.extend(_cache_hit_ratios())
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    """Forget everything recorded so far in this process."""
+    with _lock:
+        for metric in (request_latency, request_queries, request_db_time, responses, cache_lookups, db_connections):
+            metric.series.clear()
@@ -0,0 +1,77 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import connection
+
+from . import metrics
+
+
+class QueryTimer:
+    """``connection.execute_wrapper`` hook counting and timing every statement."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class MetricsMiddleware:
+    """
+    Record latency, SQL query count and database time for every request,
+    labelled by the resolved URL name (``namespace:name``), into
+    ``core.metrics``.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = self._install()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            self._uninstall(timer)
+        self._record(request, response, timer, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        # Async views run their queries in the request's thread-sensitive
+        # worker thread, so the hook must go on that thread's connection.
+        timer = await sync_to_async(self._install)()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(self._uninstall)(timer)
+        self._record(request, response, timer, time.perf_counter() - started)
+        return response
+
+    def _install(self):
+        if connection.connection is not None:
+            # A persistent connection (CONN_MAX_AGE) survived from an earlier request.
+            metrics.record_connection(reused=True)
+        timer = QueryTimer()
+        connection.execute_wrappers.append(timer)
+        return timer
+
+    def _uninstall(self, timer):
+        connection.execute_wrappers.remove(timer)
+
+    def _record(self, request, response, timer, latency):
+        match = getattr(request, 'resolver_match', None)
+        view = (match.view_name or match._func_path) if match else '<unresolved>'
+        metrics.record_request(view, latency, timer.count, timer.duration, response.status_code)
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:01
+
+import datetime
+from django.db import migrations, models
+
+
+def seed_platform_stats(apps, schema_editor):
+    PlatformStats = apps.get_model('core', 'PlatformStats')
+    User = apps.get_model('auth', 'User')
+    Event = apps.get_model('events', 'Event')
+    today = datetime.date.today()
+    PlatformStats.objects.create(
+        pk=1,
+        total_organizers=User.objects.filter(groups__name='Organizer').count(),
+        total_participants=User.objects.filter(groups__name='Participant').count(),
+        total_events=Event.objects.count(),
+        total_past_events=Event.objects.filter(date__lt=today).count(),
+        past_as_of=today,
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('events', '0005_event_rsvp_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_organizers', models.PositiveIntegerField(default=0)),
+                ('total_participants', models.PositiveIntegerField(default=0)),
+                ('total_events', models.PositiveIntegerField(default=0)),
+                ('total_past_events', models.PositiveIntegerField(default=0)),
+                ('past_as_of', models.DateField(default=datetime.date.today)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'platform stats',
+            },
+        ),
+        migrations.RunPython(seed_platform_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:45
+
+from django.db import migrations, models
+from django.db.models import Q
+from django.utils import timezone
+
+
+def recount_past_events(apps, schema_editor):
+    # "Past" now means ended by a moment in time rather than dated before a day.
+    PlatformStats = apps.get_model('core', 'PlatformStats')
+    Event = apps.get_model('events', 'Event')
+    now = timezone.now()
+    PlatformStats.objects.update(
+        total_past_events=Event.objects.filter(Q(start_at__lt=now) & ~Q(end_at__gt=now)).count(),
+        past_as_of=now,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('events', '0011_event_start_at_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='platformstats',
+            name='past_as_of',
+            field=models.DateTimeField(default=timezone.now),
+        ),
+        migrations.RunPython(recount_past_events, migrations.RunPython.noop),
+    ]
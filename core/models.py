@@ -1,3 +1,101 @@
-from django.db import models
+from datetime import timedelta
 
-# Create your models here.
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+# Group names counted on the admin dashboard.
+ORGANIZER_GROUP = 'Organizer'
+PARTICIPANT_GROUP = 'Participant'
+
+# PlatformStats counter kept for each of those groups.
+ROLE_FIELDS = {
+    ORGANIZER_GROUP: 'total_organizers',
+    PARTICIPANT_GROUP: 'total_participants',
+}
+
+# How far ``past_as_of`` may lag behind now before a read advances it.
+PAST_REFRESH_INTERVAL = timedelta(minutes=5)
+
+
+class PlatformStats(models.Model):
+    """
+    Single-row snapshot of platform-wide totals for the admin dashboard.
+
+    Kept current by the signal handlers in core.signals; rebuild it from
+    scratch with ``manage.py rebuild_platform_stats``.
+    """
+    total_organizers = models.PositiveIntegerField(default=0)
+    total_participants = models.PositiveIntegerField(default=0)
+    total_events = models.PositiveIntegerField(default=0)
+    # Events that had ended by ``past_as_of`` (see events.models.past_q).
+    # Advanced lazily on read, since events become "past" without any write.
+    total_past_events = models.PositiveIntegerField(default=0)
+    past_as_of = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    SINGLETON_ID = 1
+
+    class Meta:
+        verbose_name_plural = 'platform stats'
+
+    def __str__(self):
+        return f"Platform stats ({self.updated_at:%Y-%m-%d %H:%M})"
+
+    @classmethod
+    def rebuild(cls):
+        from django.contrib.auth.models import User
+        from events.models import Event
+
+        now = timezone.now()
+        values = {
+            'total_organizers': User.objects.filter(groups__name=ORGANIZER_GROUP).count(),
+            'total_participants': User.objects.filter(groups__name=PARTICIPANT_GROUP).count(),
+            'total_events': Event.objects.count(),
+            'total_past_events': Event.objects.past(now).count(),
+            'past_as_of': now,
+        }
+        stats, _ = cls.objects.update_or_create(pk=cls.SINGLETON_ID, defaults=values)
+        return stats
+
+    @classmethod
+    def bump(cls, **deltas):
+        """Apply counter deltas with a single UPDATE, e.g. ``bump(total_events=1)``."""
+        changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        if not changes:
+            return
+        # If the row is missing, current() rebuilds it on the next read.
+        cls.objects.filter(pk=cls.SINGLETON_ID).update(**changes)
+
+    @classmethod
+    def bump_roles(cls, changes_by_group):
+        """bump() the role counters for a {group name: member count change} mapping."""
+        deltas = {}
+        for name, change in changes_by_group.items():
+            field = ROLE_FIELDS.get(name)
+            if field:
+                deltas[field] = deltas.get(field, 0) + change
+        cls.bump(**deltas)
+
+    @classmethod
+    def current(cls):
+        stats = cls.objects.filter(pk=cls.SINGLETON_ID).first()
+        if stats is None:
+            return cls.rebuild()
+        now = timezone.now()
+        if now - stats.past_as_of >= PAST_REFRESH_INTERVAL:
+            from events.models import Event
+            with transaction.atomic():
+                stats = cls.objects.select_for_update().get(pk=cls.SINGLETON_ID)
+                if now - stats.past_as_of >= PAST_REFRESH_INTERVAL:
+                    # Only the events that slipped into the past since the last read:
+                    # past now, and either not started or still running back then.
+                    then = stats.past_as_of
+                    newly_past = (
+                        Event.objects.past(now).filter(Q(start_at__gte=then) | Q(end_at__gt=then)).count()
+                    )
+                    stats.total_past_events = F('total_past_events') + newly_past
+                    stats.past_as_of = now
+                    stats.save(update_fields=['total_past_events', 'past_as_of', 'updated_at'])
+                    stats.refresh_from_db()
+        return stats
@@ -0,0 +1,109 @@
+from django.contrib.auth.models import Group, User
+from django.db.models import Case, Q, Value, When
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from core.models import PlatformStats
+from events.models import Event
+
+
+def _past_delta(start_at, end_at, delta):
+    # Only events that had ended by the snapshot's cut-off are already counted as past.
+    ended = Q(past_as_of__gt=start_at)
+    if end_at is not None:
+        ended &= Q(past_as_of__gte=end_at)
+    return Case(When(ended, then=Value(delta)), default=Value(0))
+
+
+# ----------------------------
+# Events
+# ----------------------------
+@receiver(pre_save, sender=Event)
+def remember_event_times(sender, instance, **kwargs):
+    if instance.pk:
+        instance._stats_old_times = (
+            Event.objects.filter(pk=instance.pk).values_list('start_at', 'end_at').first()
+        )
+
+
+@receiver(post_save, sender=Event)
+def count_saved_event(sender, instance, created, **kwargs):
+    if created:
+        PlatformStats.bump(total_events=1, total_past_events=_past_delta(instance.start_at, instance.end_at, 1))
+        return
+    old_times = getattr(instance, '_stats_old_times', None)
+    if old_times is not None and old_times != (instance.start_at, instance.end_at):
+        PlatformStats.bump(
+            total_past_events=(
+                _past_delta(instance.start_at, instance.end_at, 1) + _past_delta(*old_times, -1)
+            )
+        )
+
+
+@receiver(post_delete, sender=Event)
+def count_deleted_event(sender, instance, **kwargs):
+    PlatformStats.bump(total_events=-1, total_past_events=_past_delta(instance.start_at, instance.end_at, -1))
+
+
+# ----------------------------
+# Role membership
+# ----------------------------
+@receiver(m2m_changed, sender=User.groups.through)
+def count_role_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'post_add' and pk_set:
+        if reverse:
+            # group.user_set.add(*users): pk_set holds the newly added users.
+            PlatformStats.bump_roles({instance.name: len(pk_set)})
+        else:
+            names = Group.objects.filter(pk__in=pk_set).values_list('name', flat=True)
+            PlatformStats.bump_roles(dict.fromkeys(names, 1))
+
+    elif action == 'pre_remove' and pk_set:
+        # pk_set is what the caller asked to remove, not what actually exists.
+        if reverse:
+            PlatformStats.bump_roles({instance.name: -instance.user_set.filter(pk__in=pk_set).count()})
+        else:
+            names = instance.groups.filter(pk__in=pk_set).values_list('name', flat=True)
+            PlatformStats.bump_roles(dict.fromkeys(names, -1))
+
+    elif action == 'pre_clear':
+        if reverse:
+            PlatformStats.bump_roles({instance.name: -instance.user_set.count()})
+        else:
+            PlatformStats.bump_roles(dict.fromkeys(instance.groups.values_list('name', flat=True), -1))
+
+
+@receiver(pre_delete, sender=User)
+def count_deleted_user_roles(sender, instance, **kwargs):
+    # Cascaded through-table deletes do not send m2m_changed.
+    PlatformStats.bump_roles(dict.fromkeys(instance.groups.values_list('name', flat=True), -1))
+
+
+# ----------------------------
+# Home page cache
+# ----------------------------
+from core.caching import invalidate_home_events
+from events.images import image_variants_ready
+from events.models import Category
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(image_variants_ready)
+def invalidate_home_event_cards(sender, **kwargs):
+    invalidate_home_events()
+
+
+# ----------------------------
+# Metrics
+# ----------------------------
+from django.db.backends.signals import connection_created
+
+from core.metrics import record_connection
+
+
+@receiver(connection_created)
+def count_opened_connection(sender, connection, **kwargs):
+    record_connection(reused=False)
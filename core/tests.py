@@ -1,3 +1,428 @@
-from django.test import TestCase
+import json
+import re
+import statistics
+import time
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from decouple import config
+from django.contrib.auth.models import AnonymousUser, Group, User
+from django.contrib.sessions.backends.cache import SessionStore
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.query import QuerySet
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings, tag
+from django.test.signals import template_rendered
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from events import views as event_views
+from events.models import Category, Event, RSVP
+from users import views as user_views
+
+from . import metrics, views as core_views
+from .middleware import QueryTimer
+from .models import PlatformStats
+
+# Per-view limits. "queries" is the most SQL statements any request may run,
+# cold cache included, so a new N+1 fails the run regardless of timing.
+BUDGETS_PATH = Path(__file__).with_name('perf_budgets.json')
+
+# The dataset is kept small by default so the suite stays quick; raise these
+# to benchmark at production scale (BENCH_PARTICIPANTS=1000000 ...).
+BENCH_PARTICIPANTS = config('BENCH_PARTICIPANTS', default=2000, cast=int)
+BENCH_ORGANIZERS = config('BENCH_ORGANIZERS', default=20, cast=int)
+BENCH_EVENTS = config('BENCH_EVENTS', default=400, cast=int)
+BENCH_RSVPS_PER_EVENT = config('BENCH_RSVPS_PER_EVENT', default=15, cast=int)
+BENCH_ITERATIONS = config('BENCH_ITERATIONS', default=15, cast=int)
+# Wall-clock budgets depend on the machine, so they are only enforced on
+# request (BENCH_LATENCY=1); query budgets are always checked.
+BENCH_LATENCY = config('BENCH_LATENCY', default=False, cast=bool)
+# Multiplies every latency budget; use >1 on slow CI machines.
+BENCH_LATENCY_FACTOR = config('BENCH_LATENCY_FACTOR', default=1.0, cast=float)
+# Optional path to write the measurements to as JSON.
+BENCH_REPORT = config('BENCH_REPORT', default='')
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class PlatformStatsTests(TestCase):
+    """The incrementally maintained counters must always match a full rebuild."""
+    COUNTERS = ('total_organizers', 'total_participants', 'total_events', 'total_past_events')
+
+    def setUp(self):
+        self.organizers = Group.objects.get_or_create(name='Organizer')[0]
+        self.participants = Group.objects.get_or_create(name='Participant')[0]
+        self.organizer = User.objects.create(username='organizer')
+        self.category = Category.objects.create(name='Technology')
+        PlatformStats.rebuild()
+
+    def counters(self, stats):
+        return {field: getattr(stats, field) for field in self.COUNTERS}
+
+    def assertMatchesRebuild(self):
+        kept = self.counters(PlatformStats.objects.get(pk=PlatformStats.SINGLETON_ID))
+        self.assertEqual(kept, self.counters(PlatformStats.rebuild()))
+        return kept
+
+    def create_event(self, start, end=None, organizer=None):
+        start = timezone.localtime(start)
+        return Event.objects.create(
+            name='Event', description='Event', date=start.date(), time=start.time(), end_at=end,
+            location='Dhaka', category=self.category, organizer=organizer or self.organizer,
+        )
+
+    def test_event_create_move_and_delete(self):
+        now = timezone.now()
+        past = self.create_event(now - timedelta(days=30))
+        future = self.create_event(now + timedelta(days=30))
+        self.create_event(now - timedelta(days=1), end=now + timedelta(days=1))
+        self.assertEqual(self.assertMatchesRebuild()['total_past_events'], 1)
+
+        past.date = future.date
+        past.save()
+        future.date = (now - timedelta(days=10)).date()
+        future.save()
+        self.assertMatchesRebuild()
+
+        past.delete()
+        future.delete()
+        self.assertEqual(self.assertMatchesRebuild()['total_events'], 1)
+
+    def test_group_add_remove_and_clear(self):
+        users = [User.objects.create(username=f'user{i}') for i in range(3)]
+        self.assertMatchesRebuild()
+
+        users[0].groups.add(self.organizers)
+        self.organizers.user_set.add(users[1], users[2])
+        # Adding an existing member again changes nothing.
+        self.organizers.user_set.add(users[0])
+        self.assertEqual(self.assertMatchesRebuild()['total_organizers'], 3)
+
+        users[0].groups.remove(self.organizers, self.participants)
+        self.organizers.user_set.remove(users[1], self.organizer)
+        self.assertMatchesRebuild()
+
+        users[2].groups.clear()
+        self.participants.user_set.clear()
+        self.assertEqual(self.assertMatchesRebuild(), {
+            'total_organizers': 0, 'total_participants': 0, 'total_events': 0, 'total_past_events': 0,
+        })
+
+    def test_user_delete(self):
+        user = User.objects.create(username='leaving')
+        user.groups.add(self.organizers)
+        # Their events go with them.
+        self.create_event(timezone.now() - timedelta(days=3), organizer=user)
+        user.delete()
+        self.assertEqual(self.assertMatchesRebuild()['total_events'], 0)
+
+    def test_events_becoming_past_are_counted_on_the_next_read(self):
+        now = timezone.now()
+        self.create_event(now - timedelta(days=30))
+        # As if the snapshot had last been advanced a day ago: events that
+        # started since then were not past yet and must be picked up on read.
+        PlatformStats.objects.update(past_as_of=now - timedelta(days=1))
+        self.create_event(now - timedelta(hours=12))
+        self.create_event(now - timedelta(hours=12), end=now + timedelta(hours=1))
+        self.create_event(now + timedelta(hours=12))
+        self.assertEqual(PlatformStats.objects.get().total_past_events, 1)
+
+        stats = PlatformStats.current()
+        self.assertEqual(stats.total_past_events, 2)
+        self.assertGreaterEqual(stats.past_as_of, now)
+        self.assertMatchesRebuild()
+
+
+class AsyncViewTests(TestCase):
+    """
+    The URLconf picks the sync or async views once, at import, so these call
+    each async view directly and compare it with its sync twin.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_data', participants=30, organizers=2, events=12, rsvps_per_event=4, stdout=StringIO())
+        cls.admin = User.objects.get(username='admin0000000')
+        cls.organizer = User.objects.get(username='organizer0000000')
+        cls.participant = (
+            User.objects.filter(groups__name='Participant', rsvp__isnull=False).distinct().order_by('id').first()
+        )
+        cls.event = Event.objects.order_by('-rsvp_count', 'id').first()
+
+    def prepare(self, request, user):
+        # A fresh instance, so no role memoized by an earlier run is reused.
+        user = User.objects.get(pk=user.pk) if user else AnonymousUser()
+        request.user = user
+        request.session = SessionStore()
+
+        async def auser():
+            return user
+        request.auser = auser
+        return request
+
+    def capture(self, call):
+        """Run ``call``; return the page template's context and the number of queries run."""
+        contexts = []
+
+        def rendered(sender, context, **kwargs):
+            contexts.append(context.flatten())
+        template_rendered.connect(rendered)
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                response = call()
+        finally:
+            template_rendered.disconnect(rendered)
+        self.assertEqual(response.status_code, 200)
+        return contexts[0], len(queries)
+
+    def normalized(self, context, keys):
+        values = {}
+        for key in keys:
+            value = context[key]
+            if isinstance(value, QuerySet):
+                value = list(value)
+            elif hasattr(value, 'object_list'):
+                value = (list(value.object_list), value.has_next, value.has_previous)
+            values[key] = value
+        return values
+
+    def assertSameAsSync(self, sync_view, async_view, path, keys, user=None, **kwargs):
+        def run_sync():
+            request = self.prepare(RequestFactory().get(path), user)
+            return self.capture(lambda: sync_view(request, **kwargs))
+
+        def run_async():
+            request = self.prepare(AsyncRequestFactory().get(path), user)
+            return self.capture(lambda: async_to_sync(async_view)(request, **kwargs))
+
+        # Each version once against a cold cache, then once warm.
+        cache.clear()
+        sync_runs = [run_sync(), run_sync()]
+        cache.clear()
+        async_runs = [run_async(), run_async()]
+        for (sync_context, sync_queries), (async_context, async_queries) in zip(sync_runs, async_runs):
+            self.assertEqual(self.normalized(async_context, keys), self.normalized(sync_context, keys))
+            self.assertEqual(async_queries, sync_queries)
+
+    def test_home(self):
+        self.assertSameAsSync(core_views.home, core_views.ahome, '/', ['events', 'events_cache_ttl'])
+
+    def test_event_list(self):
+        self.assertSameAsSync(
+            event_views.event_list, event_views.aevent_list, '/events/?page_size=5', ['events', 'page'],
+            user=self.participant,
+        )
+
+    def test_event_list_search(self):
+        self.assertSameAsSync(
+            event_views.event_list, event_views.aevent_list, '/events/?search=forum', ['events', 'page'],
+            user=self.participant,
+        )
+
+    def test_event_details(self):
+        self.assertSameAsSync(
+            event_views.event_details, event_views.aevent_details, '/', ['event', 'attendees', 'page', 'can_rsvp'],
+            user=self.participant, event_id=self.event.id,
+        )
+
+    def test_organizer_dashboard(self):
+        self.assertSameAsSync(
+            event_views.organizer_dashboard, event_views.aorganizer_dashboard, '/',
+            ['events', 'live_stream_url', 'total_events', 'upcoming_events', 'past_events',
+             'total_participants', 'today_events'],
+            user=self.organizer,
+        )
+
+    def test_participant_dashboard(self):
+        for tab in ('upcoming', 'past'):
+            self.assertSameAsSync(
+                event_views.participant_dashboard, event_views.aparticipant_dashboard, f'/?tab={tab}',
+                ['tab', 'events', 'page', 'counts'], user=self.participant,
+            )
+
+    def test_admin_dashboard(self):
+        self.assertSameAsSync(
+            user_views.admin_dashboard, user_views.aadmin_dashboard, '/',
+            ['total_organizers', 'total_events', 'total_participants', 'total_past_events'], user=self.admin,
+        )
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def test_query_timer_counts_and_times_every_statement(self):
+        timer = QueryTimer()
+        with connection.execute_wrapper(timer):
+            User.objects.count()
+            with self.assertRaises(Exception), connection.cursor() as cursor:
+                cursor.execute('SELECT * FROM no_such_table')
+        self.assertEqual(timer.count, 2)
+        self.assertGreater(timer.duration, 0)
+
+    def test_middleware_records_requests_by_view_name(self):
+        cache.clear()
+        self.client.get(reverse('home'))
+        self.client.get('/no-such-page/')
+        body = metrics.render()
+        self.assertIn('http_request_duration_seconds_count{view="home"} 1', body)
+        # A cold home page queries the upcoming events; an unresolved URL runs no SQL.
+        home_queries = re.search(r'^http_request_db_queries_sum\{view="home"\} (\S+)$', body, re.M)
+        self.assertGreaterEqual(float(home_queries[1]), 1)
+        self.assertIn('http_request_db_queries_sum{view="<unresolved>"} 0.0', body)
+        self.assertIn('http_responses_total{view="home",status="200"} 1', body)
+        self.assertIn('http_responses_total{view="<unresolved>",status="404"} 1', body)
+        # The hook is removed again once the request is over.
+        self.assertEqual(connection.execute_wrappers, [])
+
+    async def test_middleware_records_async_requests(self):
+        await self.async_client.get(reverse('no-permission'))
+        self.assertIn('http_request_duration_seconds_count{view="no-permission"} 1', metrics.render())
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_metrics_needs_the_token_or_an_admin(self):
+        url = reverse('metrics')
+        self.assertRedirects(self.client.get(url), reverse('no-permission'))
+        self.assertRedirects(self.client.get(url, HTTP_AUTHORIZATION='Bearer wrong'), reverse('no-permission'))
+        response = self.client.get(url, HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+
+        participant = User.objects.create(username='participant')
+        self.client.force_login(participant)
+        self.assertRedirects(self.client.get(url), reverse('no-permission'))
+        with self.captureOnCommitCallbacks(execute=True):
+            participant.groups.add(Group.objects.get_or_create(name='Admin')[0])
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_empty_token_disables_token_access(self):
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer ')
+        self.assertRedirects(response, reverse('no-permission'))
+
+
+@tag('benchmark')
+class ViewBenchmarkTests(TestCase):
+    """
+    Times the main pages against a seeded dataset and checks SQL query
+    counts, and with BENCH_LATENCY=1 also p95 latency, against
+    ``perf_budgets.json``. Exclude it with
+    ``manage.py test --exclude-tag benchmark``.
+    """
+    results = {}
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            'seed_data', participants=BENCH_PARTICIPANTS, organizers=BENCH_ORGANIZERS,
+            events=BENCH_EVENTS, rsvps_per_event=BENCH_RSVPS_PER_EVENT, stdout=StringIO(),
+        )
+        cls.admin = User.objects.get(username='admin0000000')
+        cls.organizer = User.objects.get(username='organizer0000000')
+        cls.participant = (
+            User.objects.filter(groups__name='Participant', rsvp__isnull=False).distinct().order_by('id').first()
+        )
+        cls.event = Event.objects.order_by('-rsvp_count', 'id').first()
+        cls.budgets = json.loads(BUDGETS_PATH.read_text())
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if cls.results:
+            print(f"\n{'view':<24}{'p50 ms':>10}{'p95 ms':>10}{'queries':>10}")
+            for name, r in sorted(cls.results.items()):
+                print(f"{name:<24}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['queries']:>10}")
+            if BENCH_REPORT:
+                Path(BENCH_REPORT).write_text(json.dumps(cls.results, indent=2, sort_keys=True))
+
+    def measure(self, name, request, prepare=None):
+        """
+        Run ``request`` once against a cold cache and ``BENCH_ITERATIONS``
+        more times warm. Only the warm runs count towards latency; every run
+        counts towards the query ceiling.
+        """
+        cache.clear()
+        timings, max_queries = [], 0
+        for i in range(BENCH_ITERATIONS + 1):
+            if prepare:
+                prepare(i)
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = request(i)
+                elapsed = (time.perf_counter() - started) * 1000
+            self.assertLess(response.status_code, 400, f"{name} returned {response.status_code}")
+            max_queries = max(max_queries, len(queries))
+            if i:
+                timings.append(elapsed)
+
+        result = {
+            'p50_ms': statistics.median(timings),
+            'p95_ms': percentile(timings, 95),
+            'queries': max_queries,
+        }
+        self.results[name] = result
+
+        budget = self.budgets[name]
+        self.assertLessEqual(
+            result['queries'], budget['queries'],
+            f"{name} ran {result['queries']} queries (budget {budget['queries']}); look for an N+1.",
+        )
+        if BENCH_LATENCY:
+            limit = budget['p95_ms'] * BENCH_LATENCY_FACTOR
+            self.assertLessEqual(
+                result['p95_ms'], limit, f"{name} p95 {result['p95_ms']:.1f}ms exceeds {limit:.1f}ms.",
+            )
+
+    def get(self, user, url):
+        if user:
+            self.client.force_login(user)
+        return lambda i: self.client.get(url)
+
+    def test_home(self):
+        self.measure('home', self.get(None, reverse('home')))
+
+    def test_event_list(self):
+        self.measure('event_list', self.get(self.participant, reverse('event-list')))
+
+    def test_event_list_search(self):
+        self.measure('event_list_search', self.get(self.participant, reverse('event-list') + '?search=summit'))
+
+    def test_event_details(self):
+        self.measure('event_details', self.get(None, reverse('event-detail', args=[self.event.id])))
+
+    def test_organizer_dashboard(self):
+        self.measure('organizer_dashboard', self.get(self.organizer, reverse('organizer-dashboard')))
+
+    def test_participant_dashboard(self):
+        self.measure('participant_dashboard', self.get(self.participant, reverse('participant-dashboard')))
+
+    def test_admin_dashboard(self):
+        self.measure('admin_dashboard', self.get(self.admin, reverse('admin-dashboard')))
+
+    def test_user_list(self):
+        self.measure('user_list', self.get(self.admin, reverse('user-list') + '?q=participant00&role=Participant'))
+
+    def test_rsvp_event(self):
+        # A fresh participant per iteration so every request takes the seat-claiming path.
+        attending = RSVP.objects.filter(event=self.event).values('user_id')
+        users = list(
+            User.objects.filter(groups__name='Participant').exclude(id__in=attending).order_by('id')
+            [:BENCH_ITERATIONS + 1]
+        )
+        url = reverse('rsvp-event', args=[self.event.id])
+
+        def prepare(i):
+            self.client.force_login(users[i])
+
+        self.measure('rsvp_event', lambda i: self.client.post(url), prepare=prepare)
+        self.assertEqual(RSVP.objects.filter(event=self.event, user__in=users).count(), len(users))
@@ -1,7 +1,9 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
 urlpatterns = [
-    path('', views.home, name='home'),
+    path('', views.ahome if settings.ASYNC_VIEWS else views.home, name='home'),
     path('no-permission/', views.no_permission, name='no-permission'),
+    path('metrics/', views.metrics, name='metrics'),
 ]
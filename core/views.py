@@ -1,12 +1,65 @@
-from django.shortcuts import render
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.shortcuts import redirect, render
 from django.contrib.auth.decorators import login_required
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
 from events.models import Event
+from core.caching import home_events_cache_key
+from core import metrics as request_metrics
+from users.roles import has_role, ADMIN
+
+def _home_events():
+  return (
+    Event.objects.upcoming()
+    .select_related('category')
+    .order_by('start_at', 'id')[:settings.HOME_EVENT_LIMIT]
+  )
+
 
 # in your home view
 def home(request):
-  events = Event.objects.all().order_by('-date')  # or filter upcoming events
-  return render(request, 'home.html', {'events': events})
+  context = {
+    # Lazy: only evaluated when the cached card section in card.html is cold.
+    'events': _home_events(),
+    'events_cache_key': home_events_cache_key(),
+    'events_cache_ttl': settings.HOME_CACHE_TTL,
+  }
+  return render(request, 'home.html', context)
+
+
+# Async version, routed when settings.ASYNC_VIEWS is on.
+async def ahome(request):
+  events_cache_key = await sync_to_async(home_events_cache_key)()
+  events = _home_events()
+  if not await cache.ahas_key(make_template_fragment_key('home_events', [events_cache_key])):
+    # Cold fragment: fetch on the event loop rather than lazily while rendering.
+    events = [event async for event in events.aiterator()]
+  context = {
+    'events': events,
+    'events_cache_key': events_cache_key,
+    'events_cache_ttl': settings.HOME_CACHE_TTL,
+  }
+  return await sync_to_async(render)(request, 'home.html', context)
 
 
 def no_permission(request):
     return render(request, 'no_permission.html')
+
+
+def is_admin(user):
+    return user.is_superuser or has_role(user, ADMIN)
+
+
+def _has_metrics_token(request):
+    token = settings.METRICS_TOKEN
+    return bool(token) and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}')
+
+
+# Prometheus scrape target: admins, or a scraper presenting METRICS_TOKEN.
+def metrics(request):
+  if not (_has_metrics_token(request) or is_admin(request.user)):
+    return redirect('no-permission')
+  return HttpResponse(request_metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -41,10 +41,11 @@ SITE_ID = 1  # Required for django.contrib.sites
 # ----------------------------
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.MetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'users.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -129,15 +130,93 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Generate Event.image variants on a background thread after commit
+# (set False to run them inline, e.g. in tests).
+EVENT_IMAGE_VARIANTS_ASYNC = config('EVENT_IMAGE_VARIANTS_ASYNC', default=True, cast=bool)
+
+# ----------------------------
+# Cache
+# ----------------------------
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='event-management'),
+    }
+}
+
+# Home page: number of upcoming events shown and how long the rendered
+# card section is cached (it is also invalidated on Event/Category changes).
+HOME_EVENT_LIMIT = config('HOME_EVENT_LIMIT', default=9, cast=int)
+HOME_CACHE_TTL = config('HOME_CACHE_TTL', default=600, cast=int)
+
+# How long per-organizer dashboard stats may be served before recomputing.
+ORGANIZER_STATS_TTL = config('ORGANIZER_STATS_TTL', default=300, cast=int)
+
+# How long a participant's upcoming/past RSVP counts may be served before recomputing.
+PARTICIPANT_STATS_TTL = config('PARTICIPANT_STATS_TTL', default=300, cast=int)
+
+# ----------------------------
+# Pagination (cursor-based event listings)
+# ----------------------------
+EVENTS_PAGE_SIZE = config('EVENTS_PAGE_SIZE', default=12, cast=int)
+EVENTS_MAX_PAGE_SIZE = config('EVENTS_MAX_PAGE_SIZE', default=100, cast=int)
+ATTENDEES_PAGE_SIZE = config('ATTENDEES_PAGE_SIZE', default=25, cast=int)
+USERS_PAGE_SIZE = config('USERS_PAGE_SIZE', default=50, cast=int)
+
 # ----------------------------
 # Default primary key
 # ----------------------------
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# ----------------------------
+# Async views
+# ----------------------------
+# Route the read-heavy pages (home, event list/details, dashboards) to their
+# native async versions. Turn on when serving through event_management.asgi.
+ASYNC_VIEWS = config('ASYNC_VIEWS', default=False, cast=bool)
+
+# ----------------------------
+# Sessions
+# ----------------------------
+# 'django.contrib.sessions.backends.cache' keeps sessions in the cache only;
+# 'django.contrib.sessions.backends.cached_db' reads through the cache and
+# writes to the database as well, so sessions survive a cache flush.
+SESSION_ENGINE = config('SESSION_ENGINE', default='django.contrib.sessions.backends.db')
+SESSION_CACHE_ALIAS = config('SESSION_CACHE_ALIAS', default='default')
+
+# Seconds the authenticated User is cached per session (users.auth_cache).
+# 0 loads it from the database on every request.
+USER_CACHE_TTL = config('USER_CACHE_TTL', default=300, cast=int)
+
+# ----------------------------
+# Metrics
+# ----------------------------
+# /metrics/ is served to admins; a Prometheus scraper can instead send
+# "Authorization: Bearer <METRICS_TOKEN>". Empty disables token access.
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# ----------------------------
+# Live RSVP counts (server-sent events)
+# ----------------------------
+# Streams hold their connection open, so they are only served under ASGI;
+# under WSGI the pages skip the live script and the endpoints answer 204.
+LIVE_RSVP_COUNTS = config('LIVE_RSVP_COUNTS', default=ASYNC_VIEWS, cast=bool)
+# Each open stream re-reads the counts from the database this often, to pick
+# up RSVPs made in other worker processes, and is closed after
+# LIVE_RSVP_MAX_DURATION seconds (the browser reconnects on its own).
+LIVE_RSVP_POLL_INTERVAL = config('LIVE_RSVP_POLL_INTERVAL', default=5, cast=int)
+LIVE_RSVP_MAX_DURATION = config('LIVE_RSVP_MAX_DURATION', default=900, cast=int)
+# Most events one organizer dashboard stream follows.
+LIVE_RSVP_MAX_EVENTS = config('LIVE_RSVP_MAX_EVENTS', default=100, cast=int)
+
 # ----------------------------
 # Email Configuration (Activation & RSVP)
 # ----------------------------
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# Activation mail is queued in users.OutboundEmail and delivered by
+# `manage.py send_outbox`; use the locmem or filebased backend in dev/tests.
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+EMAIL_FILE_PATH = config('EMAIL_FILE_PATH', default=str(BASE_DIR / 'sent_emails'))
+EMAIL_TIMEOUT = config('EMAIL_TIMEOUT', default=10, cast=int)
 EMAIL_HOST = config('EMAIL_HOST')
 EMAIL_USE_TLS = config('EMAIL_USE_TLS')
 EMAIL_PORT = config('EMAIL_PORT')
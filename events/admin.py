@@ -1,6 +1,7 @@
 from django.contrib import admin
-from .models import Category, Event, RSVP
+from .models import Category, Event, RSVP, WaitlistEntry
 
 admin.site.register(Category)
 admin.site.register(Event)
 admin.site.register(RSVP)
+admin.site.register(WaitlistEntry)
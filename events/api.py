@@ -0,0 +1,166 @@
+"""
+Read-only JSON API for events and categories.
+
+Every response carries an ``ETag`` (and single-object responses a
+``Last-Modified``), so pollers that send ``If-None-Match`` or
+``If-Modified-Since`` get a bodyless 304 when nothing changed. Validators are
+computed from the handful of columns they depend on, before any row is
+serialized.
+"""
+import hashlib
+
+from django.db.models import Max
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.http import require_GET
+
+from .models import Category, Event, RSVP
+from .pagination import EVENT_KEYS, paginate_cursor
+from .search import SEARCH_KEYS, search_events
+
+# Public field name -> function producing its JSON value.
+EVENT_FIELDS = {
+    'id': lambda e: e.id,
+    'name': lambda e: e.name,
+    'description': lambda e: e.description,
+    'date': lambda e: e.date.isoformat(),
+    'time': lambda e: e.time.isoformat(),
+    'start_at': lambda e: e.start_at.isoformat(),
+    'end_at': lambda e: e.end_at.isoformat() if e.end_at else None,
+    'location': lambda e: e.location,
+    'category': lambda e: e.category_id,
+    'organizer': lambda e: e.organizer_id,
+    'rsvp_count': lambda e: e.rsvp_count,
+    'capacity': lambda e: e.capacity,
+    'image': lambda e: e.image.url if e.image else None,
+    'created_at': lambda e: e.created_at.isoformat(),
+    'updated_at': lambda e: e.updated_at.isoformat(),
+}
+# Model columns each public field needs loaded.
+EVENT_COLUMNS = {
+    'category': 'category_id',
+    'organizer': 'organizer_id',
+}
+
+
+def _error(message, status=400):
+    return JsonResponse({'error': message}, status=status)
+
+
+def _requested_fields(request):
+    raw = request.GET.get('fields')
+    if not raw:
+        return list(EVENT_FIELDS)
+    fields = [f.strip() for f in raw.split(',') if f.strip()]
+    unknown = [f for f in fields if f not in EVENT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return fields
+
+
+def _columns(fields, keys):
+    columns = {EVENT_COLUMNS.get(f, f) for f in fields}
+    columns.update(key.lstrip('-') for key in keys if not key.lstrip('-').startswith('search_'))
+    columns.update(['id', 'updated_at'])
+    return sorted(columns)
+
+
+def _etag(*parts):
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'"{digest}"'
+
+
+def _conditional(request, etag, last_modified, build):
+    """Return a 304 if the client's validators match, otherwise build the response."""
+    # HTTP dates have one-second resolution.
+    last_modified_ts = int(last_modified.timestamp()) if last_modified else None
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+    if not_modified is not None:
+        return not_modified
+    response = build()
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified_ts)
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _serialize(event, fields):
+    return {name: EVENT_FIELDS[name](event) for name in fields}
+
+
+# ----------------------------
+# Events
+# ----------------------------
+@require_GET
+def event_list(request):
+    try:
+        fields = _requested_fields(request)
+    except ValueError as e:
+        return _error(str(e))
+
+    events = Event.objects.all()
+    keys = EVENT_KEYS
+    category_id = request.GET.get('category')
+    search = request.GET.get('search')
+    if category_id:
+        try:
+            category_id = int(category_id)
+        except ValueError:
+            return _error("category must be an integer.")
+        events = events.filter(category_id=category_id)
+    if search:
+        events = search_events(events, search)
+        keys = SEARCH_KEYS
+
+    page = paginate_cursor(events.only(*_columns(fields, keys)), request, keys=keys)
+    rows = page.object_list
+    etag = _etag(fields, request.GET.urlencode(), [(e.id, e.updated_at) for e in rows])
+
+    # No Last-Modified: a row leaving the page (deleted, or moved elsewhere)
+    # lets an older one in without moving max(updated_at). The ETag covers the ids.
+    return _conditional(request, etag, None, lambda: JsonResponse({
+        'results': [_serialize(e, fields) for e in rows],
+        'next': f'?{page.next_query}' if page.has_next else None,
+        'previous': f'?{page.previous_query}' if page.has_previous else None,
+    }))
+
+
+@require_GET
+def event_detail(request, event_id):
+    try:
+        fields = _requested_fields(request)
+    except ValueError as e:
+        return _error(str(e))
+
+    event = Event.objects.only(*_columns(fields, [])).filter(pk=event_id).first()
+    if event is None:
+        return _error("Event not found.", status=404)
+    etag = _etag(fields, event.id, event.updated_at)
+    return _conditional(request, etag, event.updated_at, lambda: JsonResponse(_serialize(event, fields)))
+
+
+@require_GET
+def event_rsvp_count(request, event_id):
+    event = Event.objects.filter(pk=event_id).values('id', 'rsvp_count', 'updated_at').first()
+    if event is None:
+        return _error("Event not found.", status=404)
+    latest_rsvp = RSVP.objects.filter(event_id=event_id).aggregate(latest=Max('rsvp_date'))['latest']
+    last_modified = max(filter(None, [event['updated_at'], latest_rsvp]))
+    etag = _etag(event['id'], event['rsvp_count'], last_modified)
+    return _conditional(request, etag, last_modified, lambda: JsonResponse({
+        'event': event['id'],
+        'rsvp_count': event['rsvp_count'],
+    }))
+
+
+# ----------------------------
+# Categories
+# ----------------------------
+@require_GET
+def category_list(request):
+    # Categories carry no timestamp and the table is small: validate on content.
+    categories = list(Category.objects.order_by('id').values('id', 'name', 'description'))
+    etag = _etag([tuple(c.values()) for c in categories])
+    return _conditional(request, etag, None, lambda: JsonResponse({'results': categories}))
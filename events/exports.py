@@ -0,0 +1,59 @@
+import csv
+import json
+
+from django.http import StreamingHttpResponse
+
+from .models import RSVP
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_COLUMNS = ['event_id', 'event_name', 'username', 'first_name', 'last_name', 'email', 'rsvp_date']
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class _Echo:
+    """File-like object whose write() hands the line straight back to csv.writer's caller."""
+    def write(self, value):
+        return value
+
+
+def rsvp_export_queryset(**filters):
+    return (
+        RSVP.objects.filter(**filters)
+        .select_related('user', 'event')
+        .only('rsvp_date', 'event__id', 'event__name',
+              'user__username', 'user__first_name', 'user__last_name', 'user__email')
+        .order_by('event_id', 'rsvp_date', 'id')
+    )
+
+
+def _rows(queryset):
+    # iterator() streams from a server-side cursor in chunks instead of
+    # caching the whole result set on the queryset.
+    for rsvp in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        user = rsvp.user
+        yield [rsvp.event_id, rsvp.event.name, user.username, user.first_name,
+               user.last_name, user.email, rsvp.rsvp_date.isoformat()]
+
+
+def _csv_lines(queryset):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in _rows(queryset):
+        yield writer.writerow(row)
+
+
+def _ndjson_lines(queryset):
+    for row in _rows(queryset):
+        yield json.dumps(dict(zip(EXPORT_COLUMNS, row))) + '\n'
+
+
+def stream_rsvps(queryset, export_format, filename):
+    """Stream ``queryset`` as CSV or NDJSON without materializing it in memory."""
+    lines = _ndjson_lines(queryset) if export_format == 'ndjson' else _csv_lines(queryset)
+    response = StreamingHttpResponse(lines, content_type=CONTENT_TYPES.get(export_format, 'text/csv'))
+    extension = 'ndjson' if export_format == 'ndjson' else 'csv'
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{extension}"'
+    return response
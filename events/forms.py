@@ -7,16 +7,28 @@ from .models import Event, Category
 class EventForm(forms.ModelForm):
     class Meta:
         model = Event
-        fields = ['name', 'description', 'date', 'time', 'location', 'image', 'category']
+        fields = ['name', 'description', 'date', 'time', 'end_at', 'location', 'capacity', 'image', 'category']
         widgets = {
             'date': forms.DateInput(attrs={'type': 'date', 'class': 'border rounded px-2 py-1'}),
             'time': forms.TimeInput(attrs={'type': 'time', 'class': 'border rounded px-2 py-1'}),
+            'end_at': forms.DateTimeInput(attrs={'type': 'datetime-local', 'class': 'border rounded px-2 py-1'}),
             'description': forms.Textarea(attrs={'class': 'border rounded px-2 py-1', 'rows': 3}),
             'name': forms.TextInput(attrs={'class': 'border rounded px-2 py-1'}),
             'location': forms.TextInput(attrs={'class': 'border rounded px-2 py-1'}),
+            'capacity': forms.NumberInput(attrs={'class': 'border rounded px-2 py-1', 'min': 1}),
             'category': forms.Select(attrs={'class': 'border rounded px-2 py-1'}),
             'image': forms.FileInput(attrs={'class': 'border rounded px-2 py-1'}),
         }
+        labels = {'end_at': 'Ends at (optional)'}
+
+    def clean(self):
+        cleaned_data = super().clean()
+        date, time, end_at = cleaned_data.get('date'), cleaned_data.get('time'), cleaned_data.get('end_at')
+        if date and time and end_at:
+            start_at = Event(date=date, time=time).compute_start_at()
+            if end_at <= start_at:
+                self.add_error('end_at', "The event must end after it starts.")
+        return cleaned_data
 
 # ----------------------------
 # Category Form
@@ -29,3 +41,12 @@ class CategoryForm(forms.ModelForm):
             'name': forms.TextInput(attrs={'class': 'border rounded px-2 py-1'}),
             'description': forms.Textarea(attrs={'class': 'border rounded px-2 py-1', 'rows': 3}),
         }
+
+
+# ----------------------------
+# Import Form (manage.py import_events)
+# ----------------------------
+class EventImportForm(EventForm):
+    """EventForm's field rules without the upload and the per-row category query."""
+    class Meta(EventForm.Meta):
+        fields = ['name', 'description', 'date', 'time', 'location', 'capacity']
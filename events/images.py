@@ -0,0 +1,112 @@
+"""
+Resized WebP/JPEG variants of ``Event.image``.
+
+Variants are written next to the original (``events_assets/<name>__card.webp``)
+after the upload is committed, on a background thread so the request that
+saved the event never waits on Pillow. ``manage.py generate_image_variants``
+backfills existing events.
+"""
+import logging
+import os
+import threading
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.dispatch import Signal
+from PIL import Image, ImageOps
+
+from .models import Event, default_event_image
+
+logger = logging.getLogger(__name__)
+
+# Sent with ``event_id`` once new variants are recorded on an event.
+image_variants_ready = Signal()
+
+# name -> target width in pixels
+VARIANTS = {
+    'card': 400,
+    'card_2x': 800,
+    'detail': 1200,
+    'detail_2x': 2400,
+}
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def needs_variants(event):
+    name = event.image.name if event.image else ''
+    return bool(name) and name != default_event_image() and event.image_variants.get('source') != name
+
+
+def _render(image, width, ext):
+    variant = image.copy()
+    if variant.width > width:
+        variant.thumbnail((width, width * variant.height // variant.width), Image.LANCZOS)
+    pil_format, options = FORMATS[ext]
+    if pil_format == 'JPEG' and variant.mode != 'RGB':
+        variant = variant.convert('RGB')
+    buffer = BytesIO()
+    variant.save(buffer, pil_format, **options)
+    return variant.width, buffer.getvalue()
+
+
+def generate_variants(event_id):
+    """Write every variant for the event's current image and record them on the row."""
+    event = Event.objects.filter(pk=event_id).only('id', 'image', 'image_variants').first()
+    if event is None or not needs_variants(event):
+        return None
+
+    source = event.image.name
+    stem, _ = os.path.splitext(source)
+    with default_storage.open(source, 'rb') as f:
+        image = ImageOps.exif_transpose(Image.open(f))
+        image.load()
+
+    variants = {'source': source}
+    full_size = None
+    for variant_name, width in sorted(VARIANTS.items(), key=lambda item: item[1]):
+        if full_size is not None:
+            # Images are never upscaled, so every wider target would be a copy
+            # of the variant already rendered at the source's own width.
+            variants[variant_name] = full_size
+            continue
+        entry = {}
+        for ext in FORMATS:
+            actual_width, data = _render(image, width, ext)
+            path = f'{stem}__{variant_name}.{ext}'
+            if default_storage.exists(path):
+                default_storage.delete(path)
+            entry[ext] = default_storage.save(path, ContentFile(data))
+            entry['width'] = actual_width
+        variants[variant_name] = entry
+        if width >= image.width:
+            full_size = entry
+
+    # Only record the result if the image was not replaced in the meantime.
+    if Event.objects.filter(pk=event_id, image=source).update(image_variants=variants):
+        image_variants_ready.send(sender=Event, event_id=event_id)
+    return variants
+
+
+def _generate_in_thread(event_id):
+    try:
+        generate_variants(event_id)
+    except Exception:
+        logger.exception("Could not generate image variants for event %s", event_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_variants(event_id):
+    """Generate variants once the current transaction commits, off the request thread."""
+    def run():
+        if settings.EVENT_IMAGE_VARIANTS_ASYNC:
+            threading.Thread(target=_generate_in_thread, args=(event_id,), daemon=True).start()
+        else:
+            generate_variants(event_id)
+    transaction.on_commit(run)
@@ -0,0 +1,149 @@
+"""
+Live RSVP counts over server-sent events.
+
+RSVP signal handlers call ``publish_rsvp_counts`` once their transaction
+commits. It reads the new counts and hands them to every stream subscribed in
+this process, through the ``Broadcaster``. A stream in another worker process
+never hears those messages, so each stream also polls the database every
+``LIVE_RSVP_POLL_INTERVAL`` seconds and sends any count it has not sent yet.
+With one process the push arrives at once; with several, the poll bounds the
+delay.
+
+Streams are async generators and are only served under ASGI (see
+``LIVE_RSVP_COUNTS``): under WSGI every open stream would hold a worker
+thread for ``LIVE_RSVP_MAX_DURATION`` seconds.
+"""
+import asyncio
+import json
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+
+from .models import Event
+
+
+# ----------------------------
+# In-process broadcaster
+# ----------------------------
+class Broadcaster:
+    """
+    Fan messages out to subscriber queues by topic. ``publish`` may be called
+    from any thread; each queue is fed through the event loop that created it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, *topics):
+        """Subscribe one ``asyncio.Queue`` to every topic; call from a coroutine."""
+        queue, loop = asyncio.Queue(), asyncio.get_running_loop()
+        deliver = lambda message: loop.call_soon_threadsafe(queue.put_nowait, message)
+        with self._lock:
+            for topic in topics:
+                self._subscribers.setdefault(topic, {})[queue] = deliver
+        return queue
+
+    def unsubscribe(self, queue, *topics):
+        with self._lock:
+            for topic in topics:
+                subscribers = self._subscribers.get(topic, {})
+                subscribers.pop(queue, None)
+                if not subscribers:
+                    self._subscribers.pop(topic, None)
+
+    def publish(self, topic, message):
+        with self._lock:
+            deliveries = list(self._subscribers.get(topic, {}).values())
+        for deliver in deliveries:
+            try:
+                deliver(message)
+            except RuntimeError:
+                pass  # The stream's event loop has already closed.
+
+    def has_subscribers(self):
+        with self._lock:
+            return bool(self._subscribers)
+
+
+broadcaster = Broadcaster()
+
+
+def event_topic(event_id):
+    return f'event:{event_id}'
+
+
+def publish_rsvp_counts(event_ids):
+    """Push the current rsvp_count of these events to subscribed streams."""
+    if not broadcaster.has_subscribers():
+        return
+    for event_id, count in Event.objects.filter(id__in=list(event_ids)).values_list('id', 'rsvp_count'):
+        broadcaster.publish(event_topic(event_id), {'event': event_id, 'rsvp_count': count})
+
+
+# ----------------------------
+# Database polling fallback
+# ----------------------------
+def _poll(event_ids, filters):
+    counts = dict(Event.objects.filter(id__in=event_ids, **filters).values_list('id', 'rsvp_count'))
+    # Don't hold a database connection while the stream sleeps; the next poll reconnects.
+    if not connection.in_atomic_block:
+        connection.close()
+    return counts
+
+
+apoll = sync_to_async(_poll)
+
+
+# ----------------------------
+# Streams
+# ----------------------------
+def _sse(message):
+    return f'event: rsvp_count\ndata: {json.dumps(message)}\n\n'
+
+
+def _as_changes(counts):
+    return [{'event': event_id, 'rsvp_count': count} for event_id, count in counts.items()]
+
+
+def _frames(sent, changes):
+    """SSE frames for the changes whose count differs from what was last sent."""
+    for change in changes:
+        if sent.get(change['event']) != change['rsvp_count']:
+            sent[change['event']] = change['rsvp_count']
+            yield _sse(change)
+
+
+async def rsvp_count_stream(event_ids, filters=None):
+    """
+    Yield SSE frames for every rsvp_count change of ``event_ids`` (narrowed
+    by ``filters``). The stream ends after LIVE_RSVP_MAX_DURATION seconds;
+    EventSource clients reconnect by themselves.
+    """
+    filters = filters or {}
+    interval = settings.LIVE_RSVP_POLL_INTERVAL
+    deadline = time.monotonic() + settings.LIVE_RSVP_MAX_DURATION
+    counts = await apoll(event_ids, filters)
+    # Only the events that exist (and pass the filters) are followed.
+    event_ids = list(counts)
+    topics = [event_topic(event_id) for event_id in event_ids]
+    queue = broadcaster.subscribe(*topics)
+    try:
+        sent = {}
+        yield f'retry: {interval * 1000}\n\n'
+        for frame in _frames(sent, _as_changes(counts)):
+            yield frame
+        while time.monotonic() < deadline:
+            try:
+                changes = [await asyncio.wait_for(queue.get(), timeout=interval)]
+            except asyncio.TimeoutError:
+                # Nothing pushed in this process: changes made by other workers show up here.
+                changes = _as_changes(await apoll(event_ids, filters))
+                yield ': keepalive\n\n'
+            for frame in _frames(sent, changes):
+                yield frame
+    finally:
+        broadcaster.unsubscribe(queue, *topics)
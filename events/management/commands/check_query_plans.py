@@ -0,0 +1,157 @@
+import json
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import RequestFactory, override_settings
+
+from core import views as core_views
+from events import views as event_views
+from events.models import Event
+from users import views as user_views
+from users.roles import ADMIN, ORGANIZER, PARTICIPANT
+
+
+class SelectRecorder:
+    """``execute_wrapper`` hook keeping every SELECT a view runs, with its params."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith('SELECT'):
+            self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the read-only views against the current database, EXPLAIN every query they issue "
+        "and fail if any plan sequentially scans a large table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-rows', type=int, default=10000,
+                            help="Only flag sequential scans of tables with at least this many rows.")
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            raise CommandError(f"Query plan checks are not supported on {connection.vendor}.")
+        self.min_rows = options['min_rows']
+        self.verbosity = options['verbosity']
+        self.table_rows = {}
+
+        problems = 0
+        # A dummy cache so every view takes its cold, database-backed path.
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}):
+            for name, view, path, user, args in self.probes():
+                recorder = SelectRecorder()
+                request = RequestFactory().get(path)
+                request.user = user
+                with connection.execute_wrapper(recorder):
+                    view(request, *args)
+                problems += self.report(name, recorder.queries)
+
+        if problems:
+            raise CommandError(f"{problems} sequential scan(s) of large tables found.")
+        self.stdout.write(self.style.SUCCESS("No sequential scans of large tables."))
+
+    # ----------------------------
+    # Views and representative inputs
+    # ----------------------------
+    def probes(self):
+        anonymous = AnonymousUser()
+        organizer = (
+            User.objects.filter(groups__name=ORGANIZER).annotate(n=Count('event')).order_by('-n').first()
+        )
+        participant = (
+            User.objects.filter(groups__name=PARTICIPANT).annotate(n=Count('rsvp')).order_by('-n').first()
+        )
+        admin = (
+            User.objects.filter(is_superuser=True).first()
+            or User.objects.filter(groups__name=ADMIN).first()
+        )
+        event = Event.objects.order_by('-rsvp_count', 'id').first()
+        category_id = (
+            Event.objects.values_list('category_id', flat=True)
+            .annotate(n=Count('id')).order_by('-n').first()
+        )
+
+        yield 'home', core_views.home, '/', anonymous, ()
+        if participant:
+            yield 'event_list', event_views.event_list, '/events/', participant, ()
+            yield 'event_list?category', event_views.event_list, f'/events/?category={category_id}', participant, ()
+            yield 'event_list?search', event_views.event_list, '/events/?search=summit', participant, ()
+            yield 'participant_dashboard', event_views.participant_dashboard, '/', participant, ()
+        if event:
+            yield 'event_details', event_views.event_details, '/', anonymous, (event.id,)
+        if organizer:
+            yield 'organizer_dashboard', event_views.organizer_dashboard, '/', organizer, ()
+        if admin:
+            yield 'admin_dashboard', user_views.admin_dashboard, '/', admin, ()
+            yield 'user_list', user_views.user_list, '/', admin, ()
+            yield 'user_list?search', user_views.user_list, '/?q=participant001&role=Participant&active=1', admin, ()
+
+    # ----------------------------
+    # Plans
+    # ----------------------------
+    def report(self, name, queries):
+        self.stdout.write(f"{name}: {len(queries)} queries")
+        problems = 0
+        for sql, params in queries:
+            plan, scanned = self.explain(sql, params)
+            flagged = [table for table in scanned if self.rows(table) >= self.min_rows]
+            if self.verbosity > 1 or flagged:
+                self.stdout.write(f"  {sql}")
+                for line in plan:
+                    self.stdout.write(f"    {line}")
+            for table in flagged:
+                problems += 1
+                self.stdout.write(self.style.ERROR(
+                    f"  sequential scan of {table} (~{self.rows(table)} rows)"
+                ))
+        return problems
+
+    def explain(self, sql, params):
+        """Return (plan lines, tables read by a sequential scan)."""
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                root = cursor.fetchone()[0]
+                if isinstance(root, str):
+                    root = json.loads(root)
+                lines, scanned = [], []
+                self._walk_pg(root[0]['Plan'], 0, lines, scanned)
+                return lines, scanned
+
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            lines, scanned = [], []
+            for row in cursor.fetchall():
+                detail = row[-1]
+                lines.append(detail)
+                words = detail.split()
+                # "SCAN t" is a full table scan; "SCAN t USING INDEX i" walks an index in order.
+                if words[:1] == ['SCAN'] and 'USING' not in words and 'VIRTUAL' not in words:
+                    scanned.append(words[1])
+            return lines, scanned
+
+    def _walk_pg(self, node, depth, lines, scanned):
+        relation = node.get('Relation Name')
+        lines.append('  ' * depth + node['Node Type'] + (f' on {relation}' if relation else ''))
+        if node['Node Type'] == 'Seq Scan':
+            scanned.append(relation)
+        for child in node.get('Plans', []):
+            self._walk_pg(child, depth + 1, lines, scanned)
+
+    def rows(self, table):
+        if table not in self.table_rows:
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [table])
+                    row = cursor.fetchone()
+                    self.table_rows[table] = max(row[0], 0) if row else 0
+                else:
+                    cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+                    self.table_rows[table] = cursor.fetchone()[0]
+        return self.table_rows[table]
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from events.images import generate_variants, needs_variants
+from events.models import Event, default_event_image
+
+
+class Command(BaseCommand):
+    help = "Generate resized image variants for events that do not have them yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Regenerate variants for every event.")
+
+    def handle(self, *args, **options):
+        events = Event.objects.exclude(image='').exclude(image=default_event_image()).only('id', 'image', 'image_variants')
+        if options['force']:
+            events.update(image_variants={})
+        done = failed = 0
+        for event in events.iterator(chunk_size=500):
+            if not needs_variants(event):
+                continue
+            try:
+                generate_variants(event.id)
+                done += 1
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"Event {event.id}: {e}")
+        self.stdout.write(self.style.SUCCESS(f"Generated variants for {done} events ({failed} failed)."))
@@ -0,0 +1,200 @@
+import csv
+import json
+import os
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core.caching import invalidate_home_events
+from core.models import PlatformStats
+from events import search
+from events.forms import EventImportForm
+from events.models import Category, Event, WaitlistEntry
+from events.rsvp import promote_waitlist
+from events.stats import invalidate_organizer_stats
+from users.roles import ADMIN, ORGANIZER
+
+FIELDS = ['name', 'description', 'date', 'time', 'location', 'category', 'organizer', 'capacity']
+FORMATS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+# Columns an import overwrites on an event it imported before.
+UPDATE_FIELDS = ['description', 'location', 'category', 'capacity', 'updated_at']
+
+
+def read_rows(path, fmt):
+    """
+    Yield (line number, row, error) per input row without loading the whole
+    file. Rows that cannot be parsed come back with row None and an error.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row, None
+            return
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, None, f"invalid JSON: {e.msg} at column {e.colno}"
+                continue
+            if not isinstance(row, dict):
+                yield line_number, None, f"expected a JSON object, got {type(row).__name__}"
+                continue
+            yield line_number, row, None
+
+
+def natural_key(event):
+    """Events are matched across imports on organizer, name and start."""
+    return event.organizer_id, event.name, event.start_at
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-import events from a CSV or NDJSON (one JSON object per line) file with columns "
+        "name, description, date, time, location, category, organizer[, capacity]. "
+        "category is a category name and organizer a username. An event with the same "
+        "organizer, name, date and time as an existing one updates it, so re-running "
+        "an import does not duplicate events."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help="Defaults to the file extension (.csv, .ndjson or .jsonl).")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--rejects', help="Where to write rejected rows (default: <path>.rejects.csv).")
+        parser.add_argument('--create-categories', action='store_true', help="Create unknown categories instead of rejecting the row.")
+        parser.add_argument('--dry-run', action='store_true', help="Validate only; write nothing.")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f"No such file: {path}")
+        fmt = options['format'] or FORMATS.get(os.path.splitext(path)[1].lower())
+        if fmt is None:
+            raise CommandError(f"Cannot tell the format of {path}; pass --format csv or --format ndjson.")
+        batch_size = options['batch_size']
+        self.dry_run = options['dry_run']
+        self.create_categories = options['create_categories']
+
+        # In-memory lookups: one query each instead of one per row.
+        self.categories = {name.lower(): pk for pk, name in Category.objects.values_list('id', 'name')}
+        self.organizers = dict(
+            User.objects.filter(groups__name__in=[ORGANIZER, ADMIN]).values_list('username', 'id')
+        )
+        self.organizers.update(User.objects.filter(is_superuser=True).values_list('username', 'id'))
+
+        rejects_path = options['rejects'] or f'{path}.rejects.csv'
+        imported = updated = rejected = 0
+        touched_organizers = set()
+        batch = []
+        started = time.perf_counter()
+
+        with open(rejects_path, 'w', newline='', encoding='utf-8') as rejects_file:
+            rejects = csv.writer(rejects_file)
+            rejects.writerow(['line'] + FIELDS + ['error'])
+
+            for line, row, error in read_rows(path, fmt):
+                event = None
+                if error is None:
+                    event, error = self.build_event(row)
+                if error:
+                    rejects.writerow([line] + [(row or {}).get(f, '') for f in FIELDS] + [error])
+                    rejected += 1
+                    continue
+                batch.append(event)
+                if len(batch) >= batch_size:
+                    created, changed = self.flush(batch, touched_organizers)
+                    imported, updated = imported + created, updated + changed
+                    batch = []
+                    self.report(imported + updated, rejected, started)
+            created, changed = self.flush(batch, touched_organizers)
+            imported, updated = imported + created, updated + changed
+
+        if (imported or updated) and not self.dry_run:
+            PlatformStats.rebuild()
+            invalidate_home_events()
+            for organizer_id in touched_organizers:
+                invalidate_organizer_stats(organizer_id)
+
+        self.report(imported + updated, rejected, started)
+        if rejected:
+            self.stdout.write(f"Rejected rows written to {rejects_path}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Validated' if self.dry_run else 'Imported'} {imported} events, "
+            f"updated {updated}, rejected {rejected}."
+        ))
+
+    def build_event(self, row):
+        row = {key: ('' if value is None else str(value).strip()) for key, value in row.items()}
+        form = EventImportForm(data=row)
+        if not form.is_valid():
+            errors = '; '.join(f"{field}: {' '.join(msgs)}" for field, msgs in form.errors.items())
+            return None, errors
+
+        organizer_id = self.organizers.get(row.get('organizer', ''))
+        if organizer_id is None:
+            return None, f"organizer: unknown organizer '{row.get('organizer', '')}'"
+
+        category_name = row.get('category', '')
+        category_id = self.categories.get(category_name.lower())
+        if category_id is None:
+            if not category_name:
+                return None, "category: This field is required."
+            if not self.create_categories:
+                return None, f"category: unknown category '{category_name}'"
+            category_id = -1 if self.dry_run else Category.objects.create(name=category_name).pk
+            self.categories[category_name.lower()] = category_id
+
+        event = form.save(commit=False)
+        event.category_id = category_id
+        event.organizer_id = organizer_id
+        event.start_at = event.compute_start_at()
+        return event, None
+
+    def flush(self, batch, touched_organizers):
+        """Write one batch. Returns (events created, events updated)."""
+        if not batch or self.dry_run:
+            return len(batch), 0
+        # A later row for the same event wins over an earlier one in the batch.
+        events = list({natural_key(event): event for event in batch}.values())
+        with transaction.atomic():
+            existing = {}
+            candidates = Event.objects.filter(
+                organizer_id__in={event.organizer_id for event in events},
+                name__in={event.name for event in events},
+                start_at__in={event.start_at for event in events},
+            ).order_by('id').only('id', 'organizer_id', 'name', 'start_at')
+            for candidate in candidates:
+                existing.setdefault(natural_key(candidate), candidate.pk)
+
+            new, changed = [], []
+            now = timezone.now()
+            for event in events:
+                event.pk = existing.get(natural_key(event))
+                if event.pk is None:
+                    new.append(event)
+                else:
+                    event.updated_at = now
+                    changed.append(event)
+            created = Event.objects.bulk_create(new)
+            Event.objects.bulk_update(changed, UPDATE_FIELDS)
+            # bulk_create and bulk_update skip post_save, so index the rows here
+            # and let a raised capacity seat waitlisted users, as saving would.
+            search.index_events(event.pk for event in created + changed)
+            waitlisted = set(
+                WaitlistEntry.objects.filter(event_id__in=[event.pk for event in changed])
+                .values_list('event_id', flat=True)
+            )
+            for event_id in waitlisted:
+                transaction.on_commit(lambda event_id=event_id: promote_waitlist(event_id))
+        touched_organizers.update(event.organizer_id for event in events)
+        return len(created), len(changed)
+
+    def report(self, imported, rejected, started):
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        self.stdout.write(f"{imported} imported, {rejected} rejected, {(imported + rejected) / elapsed:.0f} rows/s")
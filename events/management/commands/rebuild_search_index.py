@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from events import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the event full-text search index from scratch."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
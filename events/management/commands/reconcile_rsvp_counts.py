@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from events.models import Event, RSVP
+
+
+class Command(BaseCommand):
+    help = "Repair drift between Event.rsvp_count and the RSVP table, one id range at a time."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        actual = Coalesce(Subquery(
+            RSVP.objects.filter(event=OuterRef('pk'))
+            .order_by().values('event').annotate(n=Count('pk')).values('n')
+        ), 0)
+
+        last_id = 0
+        checked = repaired = 0
+        while True:
+            ids = list(
+                Event.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                drifted = (
+                    Event.objects.filter(id__gte=ids[0], id__lte=ids[-1])
+                    .annotate(actual_count=actual)
+                    .exclude(rsvp_count=F('actual_count'))
+                    .values_list('id', flat=True)
+                )
+                drifted_ids = list(drifted)
+                if drifted_ids:
+                    Event.objects.filter(id__in=drifted_ids).sync_rsvp_counts()
+            checked += len(ids)
+            repaired += len(drifted_ids)
+            last_id = ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} events, repaired {repaired}."))
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-17 18:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_event_organizer'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['date', 'time', 'id'], name='event_date_time_id_idx'),
+        ),
+    ]
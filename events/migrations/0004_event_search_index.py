@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from events.search import create_search_index
+    create_search_index(schema_editor)
+
+
+def drop_search_index(apps, schema_editor):
+    from events.search import drop_search_index
+    drop_search_index(schema_editor)
+
+
+def populate_search_index(apps, schema_editor):
+    from events.search import rebuild_index
+    rebuild_index()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_event_date_time_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(populate_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.5 on 2026-10-17 18:59
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 10000
+
+
+def backfill_rsvp_counts(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    RSVP = apps.get_model('events', 'RSVP')
+    counts = (
+        RSVP.objects.filter(event=OuterRef('pk'))
+        .order_by().values('event').annotate(n=Count('pk')).values('n')
+    )
+    last_id = 0
+    while True:
+        ids = list(
+            Event.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:BATCH_SIZE]
+        )
+        if not ids:
+            break
+        Event.objects.filter(id__gte=ids[0], id__lte=ids[-1]).update(
+            rsvp_count=Coalesce(Subquery(counts), 0)
+        )
+        last_id = ids[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_event_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='rsvp_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_rsvp_counts, migrations.RunPython.noop),
+    ]
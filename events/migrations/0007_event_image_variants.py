@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_event_capacity_waitlist'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
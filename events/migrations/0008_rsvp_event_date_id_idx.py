@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_event_image_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rsvp',
+            index=models.Index(fields=['event', 'rsvp_date', 'id'], name='rsvp_event_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_rsvp_event_date_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['organizer', 'date', 'time', 'id'], name='event_organizer_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['category', 'date', 'time', 'id'], name='event_category_date_idx'),
+        ),
+    ]
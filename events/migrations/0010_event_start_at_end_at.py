@@ -0,0 +1,45 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:40
+
+from datetime import datetime
+
+from django.db import migrations, models
+from django.utils import timezone
+
+BATCH_SIZE = 5000
+
+
+def backfill_start_at(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    tz = timezone.get_default_timezone()
+    last_id = 0
+    while True:
+        batch = list(
+            Event.objects.filter(id__gt=last_id).order_by('id').only('id', 'date', 'time')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for event in batch:
+            event.start_at = timezone.make_aware(datetime.combine(event.date, event.time), tz)
+        Event.objects.bulk_update(batch, ['start_at'])
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_event_organizer_category_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='start_at',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='end_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_start_at, migrations.RunPython.noop),
+    ]
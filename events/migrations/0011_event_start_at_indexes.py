@@ -0,0 +1,48 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_event_start_at_end_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='start_at',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_date_time_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_organizer_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_category_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['start_at', 'id'], name='event_start_at_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['organizer', 'start_at', 'id'], name='event_organizer_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['category', 'start_at', 'id'], name='event_category_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['end_at'], name='event_end_at_idx'),
+        ),
+    ]
@@ -1,4 +1,8 @@
-from django.db import models
+from datetime import datetime, timedelta
+
+from django.db import models, transaction
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Now
 from django.contrib.auth.models import User
 from django.utils import timezone
 
@@ -12,29 +16,171 @@ class Category(models.Model):
     def __str__(self):
         return self.name
 
+# ----------------------------
+# Time ranges (all on the indexed start_at / end_at columns)
+# ----------------------------
+def upcoming_q(now):
+    return Q(start_at__gte=now)
+
+
+def ongoing_q(now):
+    return Q(start_at__lte=now, end_at__gt=now)
+
+
+def current_q(now):
+    """Not over yet: upcoming or still running."""
+    return upcoming_q(now) | ongoing_q(now)
+
+
+def past_q(now):
+    # Started, and not still running. Events without an end_at are over once they start.
+    return Q(start_at__lt=now) & ~Q(end_at__gt=now)
+
+
+def day_q(day):
+    """Events starting on ``day`` in the site's time zone."""
+    start = timezone.make_aware(datetime.combine(day, datetime.min.time()), timezone.get_default_timezone())
+    return Q(start_at__gte=start, start_at__lt=start + timedelta(days=1))
+
+
+class EventQuerySet(models.QuerySet):
+    def upcoming(self, now=None):
+        return self.filter(upcoming_q(now or timezone.now()))
+
+    def ongoing(self, now=None):
+        return self.filter(ongoing_q(now or timezone.now()))
+
+    def past(self, now=None):
+        return self.filter(past_q(now or timezone.now()))
+
+    def on_day(self, day=None):
+        return self.filter(day_q(day or timezone.localdate()))
+
+    def bulk_create(self, objs, *args, **kwargs):
+        # save() is bypassed, so derive start_at here as well.
+        for obj in objs:
+            obj.start_at = obj.compute_start_at()
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def sync_rsvp_counts(self):
+        """Recompute rsvp_count from the RSVP table for every event in this queryset."""
+        counts = (
+            RSVP.objects.filter(event=OuterRef('pk'))
+            .order_by().values('event').annotate(n=Count('pk')).values('n')
+        )
+        return self.update(rsvp_count=Coalesce(Subquery(counts), 0), updated_at=Now())
+
+
 class Event(models.Model):
     name = models.CharField(max_length=200)
     description = models.TextField()
     date = models.DateField()
     time = models.TimeField()
+    # ``date`` + ``time`` in the site's time zone, kept in sync by save().
+    start_at = models.DateTimeField(editable=False)
+    end_at = models.DateTimeField(null=True, blank=True)
     location = models.CharField(max_length=200)
     image = models.ImageField(upload_to='events_assets/', default=default_event_image)
+    # Resized copies of ``image`` written by events.images, keyed by variant name.
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='events')
     participants = models.ManyToManyField(User, through='RSVP', related_name='rsvped_events' ,blank=True)
     organizer = models.ForeignKey(User, on_delete=models.CASCADE,default=1)
+    # Denormalized count of RSVP rows, maintained by events.signals.
+    rsvp_count = models.PositiveIntegerField(default=0, editable=False)
+    # Maximum number of RSVPs; leave empty for unlimited seating.
+    capacity = models.PositiveIntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = EventQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Backs keyset pagination over (start_at, id) and upcoming/past range scans.
+            models.Index(fields=['start_at', 'id'], name='event_start_at_id_idx'),
+            # Organizer dashboards: one organizer's events by start (stats and listing).
+            models.Index(fields=['organizer', 'start_at', 'id'], name='event_organizer_start_idx'),
+            # Category-filtered event lists, paged in start order.
+            models.Index(fields=['category', 'start_at', 'id'], name='event_category_start_idx'),
+            # Events still running past their start ("happening now", past counts).
+            models.Index(fields=['end_at'], name='event_end_at_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.date})"
 
+    def compute_start_at(self):
+        # Forms and views may assign the raw strings from a POST.
+        day = self._meta.get_field('date').to_python(self.date)
+        at = self._meta.get_field('time').to_python(self.time)
+        return timezone.make_aware(datetime.combine(day, at), timezone.get_default_timezone())
+
+    def save(self, *args, **kwargs):
+        self.start_at = self.compute_start_at()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'date', 'time'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'start_at'}
+        super().save(*args, **kwargs)
+
+class RSVPQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create skips post_save (and with ignore_conflicts we cannot tell
+        # which rows were inserted), so resync the touched events instead.
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            event_ids = {obj.event_id for obj in objs}
+            if event_ids:
+                events = Event.objects.using(self.db).filter(id__in=event_ids)
+                events.sync_rsvp_counts()
+                organizer_ids = set(events.values_list('organizer_id', flat=True).distinct())
+                user_ids = {obj.user_id for obj in objs}
+                from .live import publish_rsvp_counts
+                from .stats import invalidate_organizer_stats, invalidate_participant_stats
+
+                def after_commit():
+                    # Not before: a concurrent reader could re-cache the old stats.
+                    for organizer_id in organizer_ids:
+                        invalidate_organizer_stats(organizer_id)
+                    invalidate_participant_stats(*user_ids)
+                    publish_rsvp_counts(event_ids)
+                transaction.on_commit(after_commit, using=self.db)
+        return objs
+
+
 class RSVP(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     event = models.ForeignKey(Event, on_delete=models.CASCADE)
     rsvp_date = models.DateTimeField(auto_now_add=True)
 
+    objects = RSVPQuerySet.as_manager()
+
     class Meta:
         unique_together = ('user', 'event')
+        indexes = [
+            # Attendee lists page through an event's RSVPs in rsvp_date order.
+            models.Index(fields=['event', 'rsvp_date', 'id'], name='rsvp_event_date_id_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Keep the insert and the rsvp_count bump from post_save in one transaction.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.user.username} RSVP'd to {self.event.name}"
+
+
+class WaitlistEntry(models.Model):
+    """A user waiting for a seat on a full event, promoted in FIFO order."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='waitlist')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('user', 'event')
+        ordering = ['created_at', 'id']
+        verbose_name_plural = 'waitlist entries'
+
+    def __str__(self):
+        return f"{self.user.username} waiting for {self.event.name}"
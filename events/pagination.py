@@ -0,0 +1,164 @@
+import base64
+import json
+import math
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+
+# Default ordering for event listings: chronological, with the primary key as
+# a tie-breaker so every row has a unique, stable position.
+EVENT_KEYS = ('start_at', 'id')
+
+
+# ----------------------------
+# Cursor encoding
+# ----------------------------
+def encode_cursor(values):
+    raw = json.dumps([str(v) if not isinstance(v, (int, float)) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, model, keys):
+    """Turn a cursor back into typed values, or None if it is malformed."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(values, list) or len(values) != len(keys):
+        return None
+    decoded = []
+    for key, value in zip(keys, values):
+        try:
+            field = model._meta.get_field(key.lstrip('-'))
+        except FieldDoesNotExist:
+            # Annotations (e.g. a search rank) are stored as plain JSON numbers.
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                return None
+            decoded.append(value)
+            continue
+        try:
+            decoded.append(field.to_python(value))
+        except Exception:
+            return None
+    return decoded
+
+
+def _keyset_filter(keys, values, forward):
+    """
+    Build the "strictly after this row" condition for a multi-column ordering:
+    (k0 > v0) OR (k0 = v0 AND k1 > v1) OR ... with per-key direction.
+    """
+    condition = Q()
+    for i, key in enumerate(keys):
+        name = key.lstrip('-')
+        descending = key.startswith('-')
+        lookup = 'lt' if descending == forward else 'gt'
+        clause = Q(**{f'{name}__{lookup}': values[i]})
+        for prev_key, prev_value in zip(keys[:i], values[:i]):
+            clause &= Q(**{prev_key.lstrip('-'): prev_value})
+        condition |= clause
+    return condition
+
+
+def _reverse_keys(keys):
+    return [key[1:] if key.startswith('-') else f'-{key}' for key in keys]
+
+
+# ----------------------------
+# Page
+# ----------------------------
+class CursorPage:
+    def __init__(self, object_list, keys, params, has_next, has_previous):
+        self.object_list = object_list
+        self.keys = keys
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self._params = params
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def _cursor_for(self, obj):
+        return encode_cursor([getattr(obj, key.lstrip('-')) for key in self.keys])
+
+    def _query(self, param, obj):
+        params = self._params.copy()
+        params.pop('after', None)
+        params.pop('before', None)
+        params[param] = self._cursor_for(obj)
+        return params.urlencode()
+
+    @property
+    def next_query(self):
+        if not self.has_next:
+            return ''
+        return self._query('after', self.object_list[-1])
+
+    @property
+    def previous_query(self):
+        if not self.has_previous:
+            return ''
+        return self._query('before', self.object_list[0])
+
+
+def get_page_size(request):
+    default = settings.EVENTS_PAGE_SIZE
+    try:
+        size = int(request.GET.get('page_size', default))
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, settings.EVENTS_MAX_PAGE_SIZE))
+
+
+def _seek(queryset, request, keys, page_size):
+    """Order and filter ``queryset`` for the requested page; returns (rows query, forward, cursor)."""
+    after = request.GET.get('after')
+    before = request.GET.get('before')
+    cursor = decode_cursor(after or before, queryset.model, keys) if (after or before) else None
+    # A malformed cursor is ignored altogether: start from the first page.
+    forward = cursor is None or not before
+
+    ordering = keys if forward else _reverse_keys(keys)
+    queryset = queryset.order_by(*ordering)
+    if cursor is not None:
+        queryset = queryset.filter(_keyset_filter(keys, cursor, forward))
+    return queryset[:page_size + 1], forward, cursor
+
+
+def _page(rows, keys, request, page_size, forward, cursor):
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    if forward:
+        has_next, has_previous = has_more, cursor is not None
+    else:
+        rows.reverse()
+        has_next, has_previous = cursor is not None, has_more
+
+    return CursorPage(rows, keys, request.GET, has_next, has_previous)
+
+
+def paginate_cursor(queryset, request, keys=EVENT_KEYS, page_size=None):
+    """
+    Keyset pagination: seek past the cursor with an indexed WHERE clause
+    instead of an OFFSET, so page N costs the same as page 1.
+
+    ``?after=<cursor>`` moves forward, ``?before=<cursor>`` moves back.
+    """
+    keys = list(keys)
+    page_size = page_size or get_page_size(request)
+    rows, forward, cursor = _seek(queryset, request, keys, page_size)
+    return _page(list(rows), keys, request, page_size, forward, cursor)
+
+
+async def apaginate_cursor(queryset, request, keys=EVENT_KEYS, page_size=None):
+    """Async version of ``paginate_cursor`` for async views."""
+    keys = list(keys)
+    page_size = page_size or get_page_size(request)
+    rows, forward, cursor = _seek(queryset, request, keys, page_size)
+    return _page([row async for row in rows], keys, request, page_size, forward, cursor)
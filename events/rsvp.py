@@ -0,0 +1,85 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Now
+
+from .models import Event, RSVP, WaitlistEntry
+
+RSVPED = 'rsvped'
+ALREADY_RSVPED = 'already_rsvped'
+WAITLISTED = 'waitlisted'
+ALREADY_WAITLISTED = 'already_waitlisted'
+
+
+def _claim_seat(event_id):
+    """
+    Take one seat with a single conditional UPDATE. The database serializes
+    concurrent claims on the event row, so rsvp_count can never pass capacity.
+    """
+    has_room = Q(capacity__isnull=True) | Q(rsvp_count__lt=F('capacity'))
+    return Event.objects.filter(Q(pk=event_id) & has_room).update(
+        rsvp_count=F('rsvp_count') + 1, updated_at=Now()
+    ) == 1
+
+
+def _create_reserved_rsvp(user_id, event_id):
+    rsvp = RSVP(user_id=user_id, event_id=event_id)
+    rsvp._seat_reserved = True  # rsvp_count was already bumped by _claim_seat
+    rsvp.save()
+    return rsvp
+
+
+def reserve_seat(user, event_id):
+    """RSVP ``user`` to the event, or put them on its waitlist if it is full."""
+    if RSVP.objects.filter(user=user, event_id=event_id).exists():
+        return ALREADY_RSVPED
+    try:
+        with transaction.atomic():
+            if _claim_seat(event_id):
+                _create_reserved_rsvp(user.pk, event_id)
+                WaitlistEntry.objects.filter(user=user, event_id=event_id).delete()
+                return RSVPED
+    except IntegrityError:
+        # Lost a race with our own duplicate request; the rollback returned the seat.
+        return ALREADY_RSVPED
+
+    _, created = WaitlistEntry.objects.get_or_create(user=user, event_id=event_id)
+    return WAITLISTED if created else ALREADY_WAITLISTED
+
+
+def rsvp_status(user, event_id):
+    """RSVPED or WAITLISTED if ``user`` holds a seat or waitlist place on the event, else None."""
+    if RSVP.objects.filter(user=user, event_id=event_id).exists():
+        return RSVPED
+    if WaitlistEntry.objects.filter(user=user, event_id=event_id).exists():
+        return WAITLISTED
+    return None
+
+
+def cancel_rsvp(user, event_id):
+    """Drop the user's RSVP or waitlist place. Freed seats are promoted by events.signals."""
+    deleted, _ = RSVP.objects.filter(user=user, event_id=event_id).delete()
+    if not deleted:
+        deleted, _ = WaitlistEntry.objects.filter(user=user, event_id=event_id).delete()
+    return bool(deleted)
+
+
+def promote_waitlist(event_id):
+    """Move waitlisted users into free seats, oldest first. Returns how many were promoted."""
+    promoted = 0
+    while True:
+        with transaction.atomic():
+            entry = (
+                WaitlistEntry.objects.select_for_update(skip_locked=True)
+                .filter(event_id=event_id).order_by('created_at', 'id').first()
+            )
+            if entry is None or not _claim_seat(event_id):
+                return promoted
+            entry.delete()
+            try:
+                with transaction.atomic():
+                    _create_reserved_rsvp(entry.user_id, event_id)
+            except IntegrityError:
+                # Already attending (e.g. RSVPed through another path): give the seat back.
+                Event.objects.filter(pk=event_id).update(rsvp_count=F('rsvp_count') - 1, updated_at=Now())
+                continue
+        promoted += 1
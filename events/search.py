@@ -0,0 +1,176 @@
+"""
+Full-text search over events.
+
+PostgreSQL keeps a weighted ``tsvector`` column on ``events_event`` (GIN
+indexed) plus a trigram index on ``name`` so misspelled queries still match.
+SQLite keeps an FTS5 shadow table keyed by the event id, which is enough for
+development and the test suite. Any other backend falls back to ``icontains``.
+
+Both structures are created by migration ``0004_event_search_index`` and kept
+in sync by the signal handlers in ``events.signals``.
+"""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Category, Event
+
+# Search results are paged by relevance, with the id as a tie-breaker.
+SEARCH_KEYS = ('-search_rank', 'id')
+
+EVENT_TABLE = Event._meta.db_table
+CATEGORY_TABLE = Category._meta.db_table
+FTS_TABLE = f'{EVENT_TABLE}_fts'
+
+# Name matches count most, then category/location, then the description.
+PG_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(e.name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(c.name, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(e.location, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(e.description, '')), 'C')"
+)
+FTS_WEIGHTS = '10.0, 1.0, 4.0, 4.0'  # name, description, location, category
+
+
+def _vendor():
+    return connection.vendor
+
+
+def _fts_query(term):
+    """Quote each word so user input can never be parsed as FTS5 syntax."""
+    words = re.findall(r'\w+', term)
+    return ' '.join('"%s"*' % word for word in words)
+
+
+# ----------------------------
+# Schema (used by the migration)
+# ----------------------------
+def create_search_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(f'ALTER TABLE {EVENT_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector')
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS event_search_vector_idx ON {EVENT_TABLE} USING GIN (search_vector)'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS event_name_trgm_idx ON {EVENT_TABLE} USING GIN (name gin_trgm_ops)'
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+            "name, description, location, category, tokenize='porter unicode61')"
+        )
+
+
+def drop_search_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS event_name_trgm_idx')
+        schema_editor.execute('DROP INDEX IF EXISTS event_search_vector_idx')
+        schema_editor.execute(f'ALTER TABLE {EVENT_TABLE} DROP COLUMN IF EXISTS search_vector')
+    elif vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+# ----------------------------
+# Index maintenance
+# ----------------------------
+def _index_where(where, params):
+    vendor = _vendor()
+    with connection.cursor() as cursor:
+        if vendor == 'postgresql':
+            cursor.execute(
+                f'UPDATE {EVENT_TABLE} e SET search_vector = {PG_VECTOR_SQL} '
+                f'FROM {CATEGORY_TABLE} c WHERE c.id = e.category_id AND {where}',
+                params,
+            )
+        elif vendor == 'sqlite':
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid IN (SELECT e.id FROM {EVENT_TABLE} e WHERE {where})',
+                params,
+            )
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, name, description, location, category) '
+                f'SELECT e.id, e.name, e.description, e.location, c.name '
+                f'FROM {EVENT_TABLE} e JOIN {CATEGORY_TABLE} c ON c.id = e.category_id WHERE {where}',
+                params,
+            )
+
+
+def index_event(event_id):
+    _index_where('e.id = %s', [event_id])
+
+
+def index_events(event_ids):
+    event_ids = list(event_ids)
+    if event_ids:
+        placeholders = ', '.join(['%s'] * len(event_ids))
+        _index_where(f'e.id IN ({placeholders})', event_ids)
+
+
+def index_category(category_id):
+    _index_where('e.category_id = %s', [category_id])
+
+
+def unindex_event(event_id):
+    # On PostgreSQL the vector lives on the row itself and goes with it.
+    if _vendor() == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [event_id])
+
+
+def rebuild_index():
+    if _vendor() == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+    _index_where('1 = 1', [])
+
+
+# ----------------------------
+# Querying
+# ----------------------------
+def search_events(queryset, term):
+    """
+    Filter ``queryset`` down to events matching ``term`` and annotate each one
+    with ``search_rank`` (higher is more relevant).
+    """
+    term = (term or '').strip()
+    vendor = _vendor()
+
+    if vendor == 'postgresql':
+        matches = RawSQL(
+            f"({EVENT_TABLE}.search_vector @@ websearch_to_tsquery('english', %s) "
+            f"OR {EVENT_TABLE}.name %% %s)",
+            [term, term],
+            output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            f"GREATEST(ts_rank({EVENT_TABLE}.search_vector, websearch_to_tsquery('english', %s)), "
+            f"similarity({EVENT_TABLE}.name, %s))::double precision",
+            [term, term],
+            output_field=FloatField(),
+        )
+        return queryset.filter(matches).annotate(search_rank=rank)
+
+    if vendor == 'sqlite':
+        query = _fts_query(term)
+        if not query:
+            # Still annotated, so callers can order by SEARCH_KEYS.
+            return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+        matching_ids = RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [query])
+        rank = RawSQL(
+            f'SELECT -bm25({FTS_TABLE}, {FTS_WEIGHTS}) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = {EVENT_TABLE}.id',
+            [query],
+            output_field=FloatField(),
+        )
+        return queryset.filter(id__in=matching_ids).annotate(search_rank=rank)
+
+    fallback = (
+        Q(name__icontains=term) | Q(description__icontains=term)
+        | Q(location__icontains=term) | Q(category__name__icontains=term)
+    )
+    return queryset.filter(fallback).annotate(search_rank=Value(0.0, output_field=FloatField()))
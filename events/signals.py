@@ -151,3 +151,119 @@ def create_group(request):
 def group_list(request):
     groups = Group.objects.all().prefetch_related('permissions')
     return render(request, 'admin/group_list.html', {'groups': groups})
+
+
+# ----------------------------
+# Search index sync
+# ----------------------------
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from events.models import Event, Category
+from events import search
+
+
+@receiver(post_save, sender=Event)
+def index_event_for_search(sender, instance, **kwargs):
+    search.index_event(instance.pk)
+
+
+@receiver(post_delete, sender=Event)
+def unindex_event_for_search(sender, instance, **kwargs):
+    search.unindex_event(instance.pk)
+
+
+@receiver(post_save, sender=Category)
+def reindex_category_for_search(sender, instance, created, **kwargs):
+    # A renamed category changes the indexed text of every event in it.
+    if not created:
+        search.index_category(instance.pk)
+
+
+# ----------------------------
+# RSVP counters
+# ----------------------------
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Now
+from events.models import RSVP
+from events.rsvp import promote_waitlist
+
+
+@receiver(post_save, sender=RSVP)
+def increment_rsvp_count(sender, instance, created, **kwargs):
+    # events.rsvp.reserve_seat() has already claimed the seat with a conditional UPDATE.
+    if created and not getattr(instance, '_seat_reserved', False):
+        Event.objects.filter(pk=instance.event_id).update(rsvp_count=F('rsvp_count') + 1, updated_at=Now())
+
+
+@receiver(post_delete, sender=RSVP)
+def decrement_rsvp_count(sender, instance, **kwargs):
+    # Also fires for cascades (user/event deletes) and participants.remove()/clear().
+    Event.objects.filter(pk=instance.event_id, rsvp_count__gt=0).update(
+        rsvp_count=F('rsvp_count') - 1, updated_at=Now()
+    )
+    # Hand the freed seat to the waitlist once the delete is committed. If the
+    # event itself is being deleted, there is nothing left to promote.
+    event_id = instance.event_id
+    transaction.on_commit(lambda: promote_waitlist(event_id))
+
+
+# ----------------------------
+# Dashboard stats caches
+# ----------------------------
+from events.stats import invalidate_organizer_stats, invalidate_participant_stats
+
+
+# Dropped only once the change commits, so a concurrent reader cannot cache
+# the old numbers again in between.
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_stats_for_event(sender, instance, **kwargs):
+    organizer_id = instance.organizer_id
+    transaction.on_commit(lambda: invalidate_organizer_stats(organizer_id))
+
+
+@receiver(post_save, sender=RSVP)
+@receiver(post_delete, sender=RSVP)
+def invalidate_stats_for_rsvp(sender, instance, **kwargs):
+    user_id = instance.user_id
+    organizer_id = Event.objects.filter(pk=instance.event_id).values_list('organizer_id', flat=True).first()
+
+    def invalidate():
+        invalidate_participant_stats(user_id)
+        if organizer_id is not None:
+            invalidate_organizer_stats(organizer_id)
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=Event)
+def promote_waitlist_on_capacity_change(sender, instance, created, **kwargs):
+    # Raising (or removing) the capacity may free seats for waitlisted users.
+    if not created:
+        event_id = instance.pk
+        transaction.on_commit(lambda: promote_waitlist(event_id))
+
+
+# ----------------------------
+# Image variants
+# ----------------------------
+from events.images import needs_variants, schedule_variants
+
+
+@receiver(post_save, sender=Event)
+def generate_image_variants(sender, instance, **kwargs):
+    if needs_variants(instance):
+        schedule_variants(instance.pk)
+
+
+# ----------------------------
+# Live RSVP counts
+# ----------------------------
+from events.live import publish_rsvp_counts
+
+
+@receiver(post_save, sender=RSVP)
+@receiver(post_delete, sender=RSVP)
+def publish_live_rsvp_count(sender, instance, **kwargs):
+    event_id = instance.event_id
+    transaction.on_commit(lambda: publish_rsvp_counts([event_id]))
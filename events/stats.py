@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.metrics import record_cache
+
+from .models import Event, current_q, day_q, past_q, upcoming_q
+
+
+# ----------------------------
+# Organizer dashboard stats
+# ----------------------------
+def _organizer_key(organizer_id):
+    # The date is part of the key so "today" rolls over at midnight; upcoming/past
+    # may lag by up to ORGANIZER_STATS_TTL.
+    return f'organizer-stats:{organizer_id}:{timezone.localdate().isoformat()}'
+
+
+def compute_organizer_stats(organizer_id):
+    now = timezone.now()
+    return Event.objects.filter(organizer_id=organizer_id).aggregate(
+        total=Count('id'),
+        upcoming=Count('id', filter=upcoming_q(now)),
+        past=Count('id', filter=past_q(now)),
+        today=Count('id', filter=day_q(timezone.localdate())),
+        participants=Coalesce(Sum('rsvp_count'), 0),
+    )
+
+
+def get_organizer_stats(organizer_id):
+    key = _organizer_key(organizer_id)
+    stats = cache.get(key)
+    record_cache('organizer-stats', stats is not None)
+    if stats is None:
+        stats = compute_organizer_stats(organizer_id)
+        cache.set(key, stats, settings.ORGANIZER_STATS_TTL)
+    return stats
+
+
+def invalidate_organizer_stats(organizer_id):
+    cache.delete(_organizer_key(organizer_id))
+
+
+# ----------------------------
+# Participant dashboard counts
+# ----------------------------
+def _participant_key(user_id):
+    # Invalidated on the user's own RSVP changes; events moving from upcoming
+    # to past are picked up within PARTICIPANT_STATS_TTL.
+    return f'participant-stats:{user_id}'
+
+
+def compute_participant_stats(user_id):
+    now = timezone.now()
+    return Event.objects.filter(rsvp__user_id=user_id).aggregate(
+        total=Count('id'),
+        upcoming=Count('id', filter=current_q(now)),
+        past=Count('id', filter=past_q(now)),
+    )
+
+
+def get_participant_stats(user_id):
+    key = _participant_key(user_id)
+    stats = cache.get(key)
+    record_cache('participant-stats', stats is not None)
+    if stats is None:
+        stats = compute_participant_stats(user_id)
+        cache.set(key, stats, settings.PARTICIPANT_STATS_TTL)
+    return stats
+
+
+def invalidate_participant_stats(*user_ids):
+    cache.delete_many([_participant_key(user_id) for user_id in user_ids])
@@ -0,0 +1,38 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html
+
+from events.models import default_event_image
+
+register = template.Library()
+
+
+@register.simple_tag
+def event_image(event, size='card', css_class=''):
+    """
+    Render ``event.image`` as a responsive <picture> for the given size
+    ('card' or 'detail'), with WebP and JPEG srcsets at 1x and 2x. Until the
+    variants have been generated the default event image is shown instead.
+    """
+    variants = event.image_variants or {}
+    base = variants.get(size)
+    if not base or not event.image or variants.get('source') != event.image.name:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="lazy">',
+            default_storage.url(default_event_image()), event.name, css_class,
+        )
+
+    def srcset(ext):
+        candidates = [f"{default_storage.url(base[ext])} 1x"]
+        retina = variants.get(f'{size}_2x')
+        if retina and retina['width'] > base['width']:
+            candidates.append(f"{default_storage.url(retina[ext])} 2x")
+        return ', '.join(candidates)
+
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}">'
+        '<img src="{}" srcset="{}" width="{}" alt="{}" class="{}" loading="lazy">'
+        '</picture>',
+        srcset('webp'), default_storage.url(base['jpeg']), srcset('jpeg'), base['width'], event.name, css_class,
+    )
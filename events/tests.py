@@ -1,3 +1,672 @@
-from django.test import TestCase
+import csv
+import json
+import logging
+import os
+import tempfile
+import threading
+import time as clock
+from datetime import date, time
+from io import BytesIO, StringIO
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection
+from django.http import QueryDict
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.template import Context, Template
+from django.urls import reverse
+from PIL import Image
+
+from .models import Category, Event, RSVP, WaitlistEntry
+from . import exports, images, rsvp as rsvp_service, search
+from .pagination import encode_cursor
+from .stats import get_organizer_stats, get_participant_stats
+
+logger = logging.getLogger(__name__)
+
+
+def make_event(capacity=None):
+    organizer = User.objects.create(username='organizer')
+    category = Category.objects.create(name='Technology')
+    return Event.objects.create(
+        name='Launch', description='Launch day', date=date(2030, 1, 1), time=time(10, 0),
+        location='Dhaka', category=category, organizer=organizer, capacity=capacity,
+    )
+
+
+class WaitlistTests(TestCase):
+    def setUp(self):
+        self.event = make_event(capacity=2)
+        self.users = [User.objects.create(username=f'user{i}') for i in range(4)]
+
+    def test_full_event_waitlists_and_promotes_in_order(self):
+        statuses = [rsvp_service.reserve_seat(user, self.event.id) for user in self.users]
+        self.assertEqual(statuses, [rsvp_service.RSVPED, rsvp_service.RSVPED,
+                                    rsvp_service.WAITLISTED, rsvp_service.WAITLISTED])
+        self.assertEqual(rsvp_service.reserve_seat(self.users[0], self.event.id), rsvp_service.ALREADY_RSVPED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            rsvp_service.cancel_rsvp(self.users[0], self.event.id)
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.rsvp_count, 2)
+        self.assertTrue(RSVP.objects.filter(user=self.users[2], event=self.event).exists())
+        self.assertEqual(list(WaitlistEntry.objects.values_list('user', flat=True)), [self.users[3].id])
+
+    def test_raising_capacity_promotes_waitlist(self):
+        for user in self.users:
+            rsvp_service.reserve_seat(user, self.event.id)
+        self.event.capacity = 10
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.save()
+        self.assertEqual(RSVP.objects.filter(event=self.event).count(), 4)
+        self.assertFalse(WaitlistEntry.objects.exists())
+
+
+class RSVPViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.event = make_event(capacity=1)
+        self.participant = User.objects.create(username='participant')
+        self.client.force_login(self.participant)
+        self.detail_url = reverse('event-detail', args=[self.event.id])
+
+    def test_state_changes_need_a_post(self):
+        for name in ('rsvp-event', 'rsvp-cancel'):
+            self.assertEqual(self.client.get(reverse(name, args=[self.event.id])).status_code, 405)
+        RSVP.objects.create(user=self.participant, event=self.event)
+        self.client.get(reverse('rsvp-cancel', args=[self.event.id]))
+        self.assertTrue(RSVP.objects.filter(user=self.participant, event=self.event).exists())
+
+    def test_csrf_token_is_required(self):
+        client = self.client_class(enforce_csrf_checks=True)
+        client.force_login(self.participant)
+        self.assertEqual(client.post(reverse('rsvp-event', args=[self.event.id])).status_code, 403)
+        self.assertFalse(RSVP.objects.exists())
+
+    def test_event_page_offers_rsvp_then_cancel(self):
+        response = self.client.get(self.detail_url)
+        self.assertContains(response, f'action="{reverse("rsvp-event", args=[self.event.id])}" method="POST"')
+        self.assertRedirects(self.client.post(reverse('rsvp-event', args=[self.event.id])),
+                             reverse('participant-dashboard'), fetch_redirect_response=False)
+
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.context['rsvp_status'], rsvp_service.RSVPED)
+        self.assertContains(response, 'Cancel RSVP')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('rsvp-cancel', args=[self.event.id]))
+        self.assertFalse(RSVP.objects.filter(user=self.participant).exists())
+
+    def test_full_event_offers_the_waitlist(self):
+        RSVP.objects.create(user=User.objects.create(username='early'), event=self.event)
+        self.assertContains(self.client.get(self.detail_url), 'Join Waitlist')
+        self.client.post(reverse('rsvp-event', args=[self.event.id]))
+        self.assertContains(self.client.get(self.detail_url), 'Leave Waitlist')
+
+    def test_non_participants_get_no_buttons(self):
+        self.client.logout()
+        response = self.client.get(self.detail_url)
+        self.assertNotContains(response, reverse('rsvp-event', args=[self.event.id]))
+
+
+class RSVPExportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.event = make_event()
+        self.organizer = self.event.organizer
+        self.organizer.groups.add(Group.objects.get_or_create(name='Organizer')[0])
+        self.other_event = Event.objects.create(
+            name='Second', description='Second', date=date(2030, 2, 1), time=time(10, 0),
+            location='Dhaka', category=self.event.category, organizer=self.organizer,
+        )
+        self.users = [
+            User.objects.create(username=f'user{i}', first_name='Ada', last_name=f'L{i}', email=f'u{i}@example.com')
+            for i in range(5)
+        ]
+        RSVP.objects.bulk_create([RSVP(user=user, event=self.event) for user in self.users])
+        RSVP.objects.create(user=self.users[0], event=self.other_event)
+        self.client.force_login(self.organizer)
+        # Several chunks, so the stream must span more than one fetch.
+        chunk_size, exports.EXPORT_CHUNK_SIZE = exports.EXPORT_CHUNK_SIZE, 2
+        self.addCleanup(setattr, exports, 'EXPORT_CHUNK_SIZE', chunk_size)
+
+    def body(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_event_csv(self):
+        response = self.client.get(reverse('event-rsvps-export', args=[self.event.id]))
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(
+            response['Content-Disposition'], f'attachment; filename="event-{self.event.id}-rsvps.csv"',
+        )
+        rows = list(csv.DictReader(StringIO(self.body(response))))
+        self.assertEqual([row['username'] for row in rows], [user.username for user in self.users])
+        self.assertEqual(list(rows[0]), exports.EXPORT_COLUMNS)
+        self.assertEqual(
+            (rows[0]['event_name'], rows[0]['email'], rows[0]['last_name']), ('Launch', 'u0@example.com', 'L0'),
+        )
+
+    def test_organizer_ndjson_covers_all_their_events(self):
+        response = self.client.get(reverse('organizer-rsvps-export'), {'format': 'ndjson'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertTrue(response['Content-Disposition'].endswith('-rsvps.ndjson"'))
+        rows = [json.loads(line) for line in self.body(response).splitlines()]
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(
+            [row['event_id'] for row in rows], [self.event.id] * 5 + [self.other_event.id],
+        )
+        self.assertEqual(set(rows[0]), set(exports.EXPORT_COLUMNS))
+
+    def test_other_organizers_are_forbidden(self):
+        stranger = User.objects.create(username='stranger')
+        stranger.groups.add(Group.objects.get(name='Organizer'))
+        self.client.force_login(stranger)
+        response = self.client.get(reverse('event-rsvps-export', args=[self.event.id]))
+        self.assertEqual(response.status_code, 403)
+        # Their own export only covers their own (no) events.
+        self.assertEqual(self.body(self.client.get(reverse('organizer-rsvps-export'))).splitlines(),
+                         [','.join(exports.EXPORT_COLUMNS)])
+
+
+class ImageVariantTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        overrides = override_settings(MEDIA_ROOT=media.name, EVENT_IMAGE_VARIANTS_ASYNC=False)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.event = make_event()
+
+    def upload(self, width, height):
+        buffer = BytesIO()
+        Image.new('RGB', (width, height), 'navy').save(buffer, 'PNG')
+        self.event.image = SimpleUploadedFile('banner.png', buffer.getvalue(), content_type='image/png')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.save()
+        self.event.refresh_from_db()
+        return self.event.image_variants
+
+    def render(self, size):
+        template = Template("{% load event_images %}{% event_image event size 'banner' %}")
+        return template.render(Context({'event': self.event, 'size': size}))
+
+    def stored_variants(self):
+        _, files = default_storage.listdir('events_assets')
+        return sorted(name for name in files if '__' in name)
+
+    def test_variants_are_resized_and_never_upscaled(self):
+        variants = self.upload(1000, 500)
+        self.assertEqual(variants['source'], self.event.image.name)
+        self.assertEqual(
+            [variants[name]['width'] for name in images.VARIANTS], [400, 800, 1000, 1000],
+        )
+        # detail_2x would be a copy of detail, so it reuses detail's files.
+        self.assertEqual(variants['detail_2x'], variants['detail'])
+        self.assertEqual(len(self.stored_variants()), 6)
+        with default_storage.open(variants['card']['webp']) as f:
+            self.assertEqual(Image.open(f).size, (400, 200))
+
+    def test_narrow_source_is_stored_once(self):
+        variants = self.upload(326, 200)
+        self.assertEqual({variants[name]['jpeg'] for name in images.VARIANTS}, {variants['card']['jpeg']})
+        self.assertEqual(variants['card']['width'], 326)
+        self.assertEqual(len(self.stored_variants()), 2)
+        self.assertEqual(self.render('detail').count(' 1x'), 2)
+        self.assertNotIn(' 2x', self.render('detail'))
+
+    def test_srcset_lists_each_width_once(self):
+        variants = self.upload(1000, 500)
+        card = self.render('card')
+        self.assertIn(f"{default_storage.url(variants['card']['webp'])} 1x, "
+                      f"{default_storage.url(variants['card_2x']['webp'])} 2x", card)
+        self.assertIn('width="400"', card)
+        detail = self.render('detail')
+        self.assertIn(f"{default_storage.url(variants['detail']['jpeg'])} 1x", detail)
+        self.assertNotIn(' 2x', detail)
+
+    def test_default_image_until_variants_exist(self):
+        self.assertIn(default_storage.url('events_assets/default_img.jpg'), self.render('card'))
+        buffer = BytesIO()
+        Image.new('RGB', (500, 500)).save(buffer, 'PNG')
+        self.event.image = SimpleUploadedFile('new.png', buffer.getvalue(), content_type='image/png')
+        # Saved, but the variants are generated only once the save commits.
+        with self.captureOnCommitCallbacks(execute=False):
+            self.event.save()
+        html = self.render('card')
+        self.assertNotIn('<picture>', html)
+        self.assertIn('default_img.jpg', html)
+
+
+class RSVPCountTests(TestCase):
+    """Event.rsvp_count is a denormalized count of the event's RSVP rows."""
+
+    def setUp(self):
+        self.event = make_event()
+        self.other = Event.objects.create(
+            name='Other', description='Other', date=date(2030, 1, 2), time=time(10, 0),
+            location='Dhaka', category=self.event.category, organizer=self.event.organizer,
+        )
+        self.users = [User.objects.create(username=f'user{i}') for i in range(3)]
+
+    def assertCounts(self, *expected):
+        counts = [Event.objects.get(pk=event.pk).rsvp_count for event in (self.event, self.other)]
+        self.assertEqual(counts, list(expected))
+        for event in Event.objects.all():
+            self.assertEqual(event.rsvp_count, RSVP.objects.filter(event=event).count())
+
+    def test_create_and_delete(self):
+        rsvp = RSVP.objects.create(user=self.users[0], event=self.event)
+        RSVP.objects.create(user=self.users[1], event=self.event)
+        self.assertCounts(2, 0)
+        rsvp.delete()
+        self.assertCounts(1, 0)
+
+    def test_bulk_create_and_bulk_delete(self):
+        RSVP.objects.bulk_create([RSVP(user=user, event=self.event) for user in self.users])
+        RSVP.objects.bulk_create([RSVP(user=self.users[2], event=self.other)])
+        self.assertCounts(3, 1)
+        RSVP.objects.filter(user__in=self.users[:2]).delete()
+        self.assertCounts(1, 1)
+        self.event.participants.clear()
+        self.assertCounts(0, 1)
+
+    def test_bulk_create_invalidates_stats_once_committed(self):
+        cache.clear()
+        self.assertEqual(get_organizer_stats(self.event.organizer_id)['participants'], 0)
+        self.assertEqual(get_participant_stats(self.users[0].id)['total'], 0)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            RSVP.objects.bulk_create([RSVP(user=user, event=self.event) for user in self.users])
+        # Still the committed numbers until the insert commits.
+        self.assertEqual(get_organizer_stats(self.event.organizer_id)['participants'], 0)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(get_organizer_stats(self.event.organizer_id)['participants'], 3)
+        self.assertEqual(get_participant_stats(self.users[0].id)['total'], 1)
+
+    def test_deleting_a_user_cascades_to_the_count(self):
+        for event in (self.event, self.other):
+            RSVP.objects.create(user=self.users[0], event=event)
+        RSVP.objects.create(user=self.users[1], event=self.event)
+        self.users[0].delete()
+        self.assertCounts(1, 0)
+
+    def test_deleting_an_event_leaves_other_counts_alone(self):
+        for user in self.users:
+            RSVP.objects.create(user=user, event=self.event)
+        RSVP.objects.create(user=self.users[0], event=self.other)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.delete()
+        self.assertFalse(RSVP.objects.filter(event_id=self.event.pk).exists())
+        self.assertEqual(Event.objects.get(pk=self.other.pk).rsvp_count, 1)
+
+    def test_reconcile_repairs_drift(self):
+        RSVP.objects.create(user=self.users[0], event=self.event)
+        RSVP.objects.create(user=self.users[1], event=self.other)
+        Event.objects.filter(pk=self.event.pk).update(rsvp_count=7)
+        Event.objects.filter(pk=self.other.pk).update(rsvp_count=0)
+        out = StringIO()
+        call_command('reconcile_rsvp_counts', '--batch-size', '1', stdout=out)
+        self.assertIn('Checked 2 events, repaired 2.', out.getvalue())
+        self.assertCounts(1, 1)
+
+
+@override_settings(LIVE_RSVP_COUNTS=True, LIVE_RSVP_POLL_INTERVAL=1, LIVE_RSVP_MAX_DURATION=10)
+class LiveRSVPCountTests(TestCase):
+    def setUp(self):
+        self.event = make_event()
+        self.guest = User.objects.create(username='guest')
+        self.url = reverse('event-rsvp-stream', args=[self.event.id])
+
+    def reserve(self, event=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            rsvp_service.reserve_seat(self.guest, (event or self.event).id)
+
+    async def test_asgi_stream_sends_snapshot_then_pushed_change(self):
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        frames = aiter(response.streaming_content)
+        self.assertEqual(await anext(frames), b'retry: 1000\n\n')
+        self.assertIn(b'"rsvp_count": 0', await anext(frames))
+        await sync_to_async(self.reserve)()
+        self.assertIn(b'"rsvp_count": 1', await anext(frames))
+        await frames.aclose()
+
+    async def test_organizer_stream_follows_only_the_listed_own_events(self):
+        organizer = await User.objects.aget(username='organizer')
+        await organizer.groups.aadd((await Group.objects.aget_or_create(name='Organizer'))[0])
+        other = await sync_to_async(Event.objects.create)(
+            name='Other', description='Other', date=date(2030, 1, 2), time=time(10, 0), location='Dhaka',
+            category=self.event.category, organizer=await User.objects.acreate(username='someone-else'),
+        )
+        await self.async_client.aforce_login(organizer)
+        response = await self.async_client.get(
+            reverse('organizer-rsvp-stream') + f'?events={self.event.id},{other.id}'
+        )
+        frames = aiter(response.streaming_content)
+        await anext(frames)
+        snapshot = await anext(frames)
+        self.assertIn(f'"event": {self.event.id}'.encode(), snapshot)
+        # The other organizer's event is not followed: its RSVP is never pushed.
+        await sync_to_async(self.reserve)(other)
+        await sync_to_async(self.reserve)()
+        self.assertIn(f'"event": {self.event.id}, "rsvp_count": 1'.encode(), await anext(frames))
+        await frames.aclose()
+
+    def test_wsgi_gets_no_stream(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 204)
+
+    @override_settings(LIVE_RSVP_COUNTS=False)
+    def test_disabled_pages_skip_the_live_script(self):
+        response = self.client.get(reverse('event-detail', args=[self.event.id]))
+        self.assertNotContains(response, 'EventSource')
+
+    def test_unknown_event_is_404(self):
+        self.assertEqual(self.client.get(reverse('event-rsvp-stream', args=[0])).status_code, 404)
+
+
+class ParticipantDashboardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        organizer = User.objects.create(username='organizer')
+        category = Category.objects.create(name='Music')
+        self.user = User.objects.create(username='fan')
+        self.user.groups.add(Group.objects.get(name='Participant'))
+        self.client.force_login(self.user)
+        self.events = {}
+        for name, year in [('old', 2001), ('older', 2000), ('soon', 2040), ('later', 2041), ('skipped', 2042)]:
+            self.events[name] = Event.objects.create(
+                name=name, description=name, date=date(year, 1, 1), time=time(10, 0),
+                location='Dhaka', category=category, organizer=organizer,
+            )
+        for name in ('old', 'older', 'soon', 'later'):
+            RSVP.objects.create(user=self.user, event=self.events[name])
+
+    def names(self, query=''):
+        response = self.client.get(reverse('participant-dashboard') + query)
+        return [event.name for event in response.context['events']], response
+
+    def test_tabs_filter_order_and_paginate_in_sql(self):
+        self.assertEqual(self.names()[0], ['soon', 'later'])
+        self.assertEqual(self.names('?tab=past')[0], ['old', 'older'])
+
+        first, response = self.names('?tab=past&page_size=1')
+        self.assertEqual(first, ['old'])
+        self.assertEqual(self.names('?' + response.context['page'].next_query)[0], ['older'])
+
+    def test_counts_are_cached_until_the_users_rsvps_change(self):
+        self.assertEqual(self.names()[1].context['counts'], {'total': 4, 'upcoming': 2, 'past': 2})
+        with self.assertNumQueries(0):
+            get_participant_stats(self.user.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            RSVP.objects.create(user=self.user, event=self.events['skipped'])
+        self.assertEqual(self.names()[1].context['counts']['upcoming'], 3)
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create(username='organizer')
+        self.category = Category.objects.create(name='Technology')
+
+    def create(self, name, description='Meetup', category=None):
+        return Event.objects.create(
+            name=name, description=description, date=date(2030, 1, 1), time=time(10, 0),
+            location='Dhaka', category=category or self.category, organizer=self.organizer,
+        )
+
+    def found(self, term):
+        return list(
+            search.search_events(Event.objects.all(), term)
+            .order_by(*search.SEARCH_KEYS).values_list('name', flat=True)
+        )
+
+    def test_name_matches_rank_above_description_matches(self):
+        self.create('Garden party', description='Python talks after lunch')
+        self.create('Python summit')
+        self.create('Cooking class')
+        self.assertEqual(self.found('python'), ['Python summit', 'Garden party'])
+        self.assertEqual(self.found('pyth'), ['Python summit', 'Garden party'])
+
+    def test_empty_and_punctuation_terms_match_nothing_without_errors(self):
+        self.create('Python summit')
+        for term in ['', '""', '!?*', '   ']:
+            self.assertEqual(self.found(term), [])
+        self.client.force_login(self.organizer)
+        self.assertEqual(self.client.get(reverse('api-event-list'), {'search': '""'}).status_code, 200)
+        self.assertEqual(self.client.get(reverse('event-list'), {'search': '!?'}).status_code, 200)
+
+    def test_signals_keep_the_index_in_sync(self):
+        event = self.create('Python summit')
+        event.name = 'Rust summit'
+        event.save()
+        self.assertEqual(self.found('python'), [])
+        self.assertEqual(self.found('rust'), ['Rust summit'])
+
+        self.category.name = 'Robotics'
+        self.category.save()
+        self.assertEqual(self.found('robotics'), ['Rust summit'])
+
+        event.delete()
+        self.assertEqual(self.found('rust'), [])
+
+    def test_rebuild_command_restores_a_lost_index(self):
+        self.create('Python summit')
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {search.FTS_TABLE}')
+        self.assertEqual(self.found('python'), [])
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.found('python'), ['Python summit'])
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        organizer = User.objects.create(username='organizer')
+        category = Category.objects.create(name='Technology')
+        self.events = [
+            Event.objects.create(
+                name=f'Python meetup {i}', description='Talks', date=date(2030, 1, 1 + i), time=time(10, 0),
+                location='Dhaka', category=category, organizer=organizer,
+            )
+            for i in range(5)
+        ]
+        self.url = reverse('api-event-list')
+
+    def ids(self, **params):
+        response = self.client.get(self.url, {'page_size': 2, 'fields': 'id', **params})
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.json()['results']], response.json()
+
+    def test_pages_forward_and_back(self):
+        first, body = self.ids()
+        second, body = self.ids(**QueryDict(body['next'][1:]).dict())
+        self.assertEqual(first + second, [event.id for event in self.events[:4]])
+        self.assertEqual(self.ids(**QueryDict(body['previous'][1:]).dict())[0], first)
+
+    def test_tampered_search_cursor_is_ignored(self):
+        first, _ = self.ids(search='python')
+        for values in (['x', 5], [True, 5], [None, 5], [1.0]):
+            self.assertEqual(self.ids(search='python', after=encode_cursor(values))[0], first)
+
+    def test_malformed_before_cursor_starts_at_the_first_page(self):
+        first, _ = self.ids()
+        self.assertEqual(self.ids(before='not-a-cursor')[0], first)
+        self.assertEqual(self.ids(before=encode_cursor(['2030-01-01', 'x']))[0], first)
+
+
+class EventAPITests(TestCase):
+    def setUp(self):
+        self.event = make_event()
+        self.later = Event.objects.create(
+            name='Later', description='Later', date=date(2030, 2, 1), time=time(10, 0),
+            location='Dhaka', category=self.event.category, organizer=self.event.organizer,
+        )
+        self.list_url = reverse('api-event-list')
+        self.detail_url = reverse('api-event-detail', args=[self.event.id])
+
+    def test_list_etag_gives_304_until_the_page_changes(self):
+        response = self.client.get(self.list_url)
+        etag = response['ETag']
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.event.name = 'Renamed'
+        self.event.save()
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_has_no_last_modified_so_removed_rows_are_not_hidden(self):
+        response = self.client.get(self.list_url, {'page_size': 1})
+        self.assertNotIn('Last-Modified', response)
+        self.event.delete()
+        # The older row shifts onto the page; If-Modified-Since alone must not produce a 304.
+        response = self.client.get(
+            self.list_url, {'page_size': 1}, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.json()['results']], [self.later.id])
+
+    def test_detail_honours_if_modified_since(self):
+        response = self.client.get(self.detail_url)
+        last_modified = response['Last-Modified']
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+    def test_sparse_fields(self):
+        response = self.client.get(self.detail_url, {'fields': 'id,name'})
+        self.assertEqual(response.json(), {'id': self.event.id, 'name': 'Launch'})
+        rows = self.client.get(self.list_url, {'fields': 'name,rsvp_count'}).json()['results']
+        self.assertEqual(rows, [{'name': 'Launch', 'rsvp_count': 0}, {'name': 'Later', 'rsvp_count': 0}])
+        # Different field sets are different representations.
+        self.assertNotEqual(
+            self.client.get(self.detail_url, {'fields': 'id'})['ETag'], self.client.get(self.detail_url)['ETag'],
+        )
+
+    def test_category_filter(self):
+        other = Category.objects.create(name='Music')
+        self.later.category = other
+        self.later.save()
+        rows = self.client.get(self.list_url, {'category': other.id, 'fields': 'id'}).json()['results']
+        self.assertEqual(rows, [{'id': self.later.id}])
+        response = self.client.get(self.list_url, {'category': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('category', response.json()['error'])
+
+    def test_unknown_field_is_400(self):
+        response = self.client.get(self.list_url, {'fields': 'name,password'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('password', response.json()['error'])
+
+
+class ImportEventsTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create(username='organizer')
+        self.organizer.groups.add(Group.objects.get_or_create(name='Organizer')[0])
+        Category.objects.create(name='Technology')
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def row(self, name, **overrides):
+        return {
+            'name': name, 'description': 'Imported', 'date': '2030-01-01', 'time': '10:00',
+            'location': 'Dhaka', 'category': 'Technology', 'organizer': 'organizer', **overrides,
+        }
+
+    def write(self, filename, lines):
+        path = os.path.join(self.dir.name, filename)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        return path
+
+    def run_import(self, path, *args):
+        call_command('import_events', path, *args, stdout=StringIO())
+        with open(f'{path}.rejects.csv', newline='', encoding='utf-8') as f:
+            return list(csv.DictReader(f))
+
+    def test_imports_in_batches_and_indexes_the_rows(self):
+        path = self.write('events.ndjson', [json.dumps(self.row(f'Event {i}')) for i in range(5)])
+        self.assertEqual(self.run_import(path, '--batch-size', '2'), [])
+        self.assertEqual(Event.objects.count(), 5)
+        self.assertEqual(len(search.search_events(Event.objects.all(), 'imported')), 5)
+
+    def test_bad_rows_go_to_the_rejects_file_with_their_line(self):
+        path = self.write('events.ndjson', [
+            json.dumps(self.row('Good')),
+            '{"name": "Broken',
+            '',
+            '["not", "an", "object"]',
+            json.dumps(self.row('Nobody', organizer='stranger')),
+            json.dumps(self.row('Bad date', date='someday')),
+        ])
+        rejects = self.run_import(path, '--batch-size', '1')
+        self.assertEqual(list(Event.objects.values_list('name', flat=True)), ['Good'])
+        self.assertEqual([row['line'] for row in rejects], ['2', '4', '5', '6'])
+        self.assertIn('invalid JSON', rejects[0]['error'])
+        self.assertIn('JSON object', rejects[1]['error'])
+        self.assertIn('unknown organizer', rejects[2]['error'])
+        self.assertTrue(rejects[3]['error'].startswith('date:'))
+
+    def test_reimport_updates_instead_of_duplicating(self):
+        fields = list(self.row('x'))
+        path = self.write('events.csv', [','.join(fields)] + [
+            ','.join(self.row(name).values()) for name in ['Launch', 'Meetup']
+        ])
+        self.run_import(path)
+        path = self.write('events.csv', [','.join(fields + ['capacity'])] + [
+            ','.join([*self.row('Launch', location='Chattogram').values(), '50']),
+            ','.join([*self.row('Launch', time='18:00').values(), '']),
+        ])
+        self.run_import(path)
+        self.assertEqual(Event.objects.count(), 3)
+        launch = Event.objects.get(name='Launch', time=time(10, 0))
+        self.assertEqual((launch.location, launch.capacity), ('Chattogram', 50))
+        self.assertEqual(Event.objects.filter(name='Launch', time=time(18, 0)).count(), 1)
+
+    def test_unknown_extension_is_rejected(self):
+        path = self.write('events.xlsx', ['name'])
+        with self.assertRaises(CommandError):
+            call_command('import_events', path, stdout=StringIO())
+        self.assertFalse(os.path.exists(f'{path}.rejects.csv'))
+
+
+class RSVPFlashCrowdTests(TransactionTestCase):
+    """Many threads RSVP to one small event at once; nobody may be overbooked."""
+    threads = 40
+    capacity = 10
+
+    def test_concurrent_rsvps_never_overbook(self):
+        event = make_event(capacity=self.capacity)
+        users = [User.objects.create(username=f'fan{i}') for i in range(self.threads)]
+        results = []
+        start = threading.Barrier(self.threads)
+
+        def attempt(user):
+            start.wait()
+            try:
+                while True:
+                    try:
+                        results.append(rsvp_service.reserve_seat(user, event.id))
+                        return
+                    except OperationalError:
+                        # SQLite reports lock contention instead of waiting; retry.
+                        clock.sleep(0.01)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=attempt, args=(user,)) for user in users]
+        began = clock.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = clock.perf_counter() - began
+
+        event.refresh_from_db()
+        self.assertEqual(results.count(rsvp_service.RSVPED), self.capacity)
+        self.assertEqual(results.count(rsvp_service.WAITLISTED), self.threads - self.capacity)
+        self.assertEqual(event.rsvp_count, self.capacity)
+        self.assertEqual(RSVP.objects.filter(event=event).count(), self.capacity)
+        self.assertEqual(WaitlistEntry.objects.filter(event=event).count(), self.threads - self.capacity)
+        logger.debug("%d concurrent RSVPs in %.3fs (%.0f req/s)", self.threads, elapsed, self.threads / elapsed)
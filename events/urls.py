@@ -1,5 +1,6 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import views, api
 from .views import (
     EventListView,
     CategoryListView,
@@ -9,14 +10,25 @@ from .views import (
     # keep other FBVs as-is
 )
 
+# Native async versions of the read-heavy pages, for ASGI deployments.
+ASYNC = settings.ASYNC_VIEWS
+
 urlpatterns = [
     # Public
     # path("", views.event_list, name="event-list"),
-    path("events/<int:event_id>/", views.event_details, name="event-detail"),
+    path("events/<int:event_id>/", views.aevent_details if ASYNC else views.event_details, name="event-detail"),
+    path("events/<int:event_id>/rsvp/", views.rsvp_event, name="rsvp-event"),
+    path("events/<int:event_id>/rsvp/cancel/", views.cancel_rsvp, name="rsvp-cancel"),
+    path("events/<int:event_id>/rsvps/export/", views.export_event_rsvps, name="event-rsvps-export"),
+    path("events/<int:event_id>/rsvps/live/", views.event_rsvp_stream, name="event-rsvp-stream"),
 
    # Dashboards
-    path("dashboard/participant/", views.participant_dashboard, name="participant-dashboard"),
-    path("dashboard/organizer/", views.organizer_dashboard, name="organizer-dashboard"),
+    path("dashboard/participant/", views.aparticipant_dashboard if ASYNC else views.participant_dashboard,
+         name="participant-dashboard"),
+    path("dashboard/organizer/", views.aorganizer_dashboard if ASYNC else views.organizer_dashboard,
+         name="organizer-dashboard"),
+    path("dashboard/organizer/rsvps/export/", views.export_organizer_rsvps, name="organizer-rsvps-export"),
+    path("dashboard/organizer/rsvps/live/", views.organizer_rsvp_stream, name="organizer-rsvp-stream"),
     
     # Category (Admin only)
      # Categories
@@ -26,11 +38,17 @@ urlpatterns = [
     path("categories/<int:pk>/delete/", views.category_delete, name="category-delete"),
 
      # Events
-    path("", views.event_list, name="event-list"),
+    path("", views.aevent_list if ASYNC else views.event_list, name="event-list"),
     path("events/add/", views.create_event, name="event-create"),
     path("<int:pk>/edit/", views.event_update, name="event-update"),
     path("<int:pk>/delete/", views.event_delete, name="event-delete"),
 
+    # Read-only JSON API
+    path("api/events/", api.event_list, name="api-event-list"),
+    path("api/events/<int:event_id>/", api.event_detail, name="api-event-detail"),
+    path("api/events/<int:event_id>/rsvp-count/", api.event_rsvp_count, name="api-event-rsvp-count"),
+    path("api/categories/", api.category_list, name="api-category-list"),
+
     ###Class based->
     path("", EventListView.as_view(), name="event-list"),
     path("categories/", CategoryListView.as_view(), name="category-list"),
@@ -1,74 +1,148 @@
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.db.models import Count
-from .models import Event, Category, RSVP
+from django.utils import timezone
+from django.views.decorators.http import require_POST
+from .models import Event, Category, RSVP, current_q, past_q
 from .forms import EventForm
+from .pagination import paginate_cursor, EVENT_KEYS
+from .search import search_events, SEARCH_KEYS
+from .stats import get_organizer_stats, get_participant_stats
+from . import rsvp as rsvp_service
+from .exports import rsvp_export_queryset, stream_rsvps
 from django.shortcuts import render, redirect, get_object_or_404
 from .models import Category
 from django.contrib import messages
+from django.core.exceptions import PermissionDenied
 from django.contrib.auth.decorators import login_required, user_passes_test
 from datetime import date
+from itertools import islice
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from users.roles import has_role, ADMIN, ORGANIZER, PARTICIPANT
 
 def is_admin_or_organizer(user):
-    return user.is_superuser or user.groups.filter(name__in=['Admin', 'Organizer']).exists()
+    return user.is_superuser or has_role(user, ADMIN, ORGANIZER)
 
 def is_organizer(user):
-    return user.groups.filter(name='Organizer').exists()
+    return has_role(user, ORGANIZER)
 
 def is_participant(user):
-    return user.groups.filter(name='Participant').exists()
+    return has_role(user, PARTICIPANT)
+
+
+def organizer_stream_url(events):
+    """Live RSVP count stream for the events on the organizer dashboard, if enabled."""
+    if not settings.LIVE_RSVP_COUNTS:
+        return None
+    event_ids = ','.join(str(event.id) for event in islice(events, settings.LIVE_RSVP_MAX_EVENTS))
+    return f"{reverse('organizer-rsvp-stream')}?events={event_ids}"
 
 
 # Organizer Dashboard
 @user_passes_test(is_organizer, login_url='no-permission')
 def organizer_dashboard(request):
     events = Event.objects.filter(
-        organizer=request.user 
-    ).select_related('category').prefetch_related('participants')
-
-    total_events = events.count()
-    upcoming_events = events.filter(date__gte=date.today()).count()
-    past_events = events.filter(date__lt=date.today()).count()
-    total_participants = RSVP.objects.filter(event__organizer=request.user).count()
-    today_events = events.filter(date=date.today())
+        organizer=request.user
+    ).select_related('category', 'organizer').order_by('start_at', 'id')
+    stats = get_organizer_stats(request.user.id)
 
     context = {
         'events': events,
-        'total_events': total_events,
-        'upcoming_events': upcoming_events,
-        'past_events': past_events,
-        'total_participants': total_participants,
-        'today_events': today_events,
+        'live_stream_url': organizer_stream_url(events),
+        'total_events': stats['total'],
+        'upcoming_events': stats['upcoming'],
+        'past_events': stats['past'],
+        'total_participants': stats['participants'],
+        'today_events': stats['today'],
     }
     return render(request, 'dashboard/organizer_dashboard.html', context)
 
 # Participant Dashboard
+# Tabs: event filter and keyset ordering. Ongoing events stay under "upcoming"
+# until they end; past events list the most recent first.
+PARTICIPANT_TABS = {
+    'upcoming': (current_q, EVENT_KEYS),
+    'past': (past_q, ('-start_at', '-id')),
+}
+
+
+def participant_events(user, tab):
+    """The user's RSVPed events for one dashboard tab, with that tab's keyset ordering."""
+    condition, keys = PARTICIPANT_TABS[tab]
+    events = user.rsvped_events.filter(condition(timezone.now())).select_related('category')
+    return events, keys
+
+
+def participant_tab(request):
+    tab = request.GET.get('tab')
+    return tab if tab in PARTICIPANT_TABS else 'upcoming'
+
+
 @user_passes_test(is_participant, login_url='no-permission')
 def participant_dashboard(request):
-    rsvps = RSVP.objects.filter(user=request.user).select_related('event', 'event__category')
-    events = [rsvp.event for rsvp in rsvps]
-    return render(request, 'dashboard/participant_dashboard.html', {'events': events})
+    tab = participant_tab(request)
+    events, keys = participant_events(request.user, tab)
+    page = paginate_cursor(events, request, keys=keys)
+    context = {
+        'tab': tab,
+        'events': page.object_list,
+        'page': page,
+        'counts': get_participant_stats(request.user.id),
+    }
+    return render(request, 'dashboard/participant_dashboard.html', context)
 
 # Event List (all users)
 @login_required
 def event_list(request):
-    events = Event.objects.select_related('category').annotate(rsvp_count=Count('participants'))
+    events = Event.objects.select_related('category')
     # Optional: filter by category or search
     category_id = request.GET.get('category')
     search = request.GET.get('search')
     if category_id:
         events = events.filter(category_id=category_id)
+    keys = EVENT_KEYS
     if search:
-        events = events.filter(name__icontains=search)
-    return render(request, 'events/event_list.html', {'events': events})
+        events = search_events(events, search)
+        keys = SEARCH_KEYS
+    page = paginate_cursor(events, request, keys=keys)
+    return render(request, 'event_list.html', {'events': page.object_list, 'page': page})
 
 # Event Detail
 def event_details(request, event_id):
-    event = get_object_or_404(Event, id=event_id)
-    return render(request, "event_details.html", {"event": event})
+    event = get_object_or_404(
+        Event.objects.select_related('organizer', 'category').only(
+            'id', 'name', 'description', 'date', 'time', 'image', 'image_variants',
+            'rsvp_count', 'capacity', 'organizer__username', 'category__name',
+        ),
+        id=event_id,
+    )
+    attendees = (
+        RSVP.objects.filter(event_id=event.id)
+        .select_related('user')
+        .only('id', 'rsvp_date', 'user__first_name', 'user__last_name', 'user__email')
+    )
+    page = paginate_cursor(attendees, request, keys=('rsvp_date', 'id'), page_size=settings.ATTENDEES_PAGE_SIZE)
+    return render(request, "event_details.html", {
+        "event": event, "attendees": page.object_list, "page": page, "live_rsvp_counts": settings.LIVE_RSVP_COUNTS,
+        **rsvp_context(request.user, event.id),
+    })
+
+# Attendee exports (streamed)
+@login_required
+def export_event_rsvps(request, event_id):
+    event = get_object_or_404(Event.objects.only('id', 'organizer_id'), id=event_id)
+    if event.organizer_id != request.user.id and not (request.user.is_superuser or has_role(request.user, ADMIN)):
+        raise PermissionDenied("Only the event's organizer can export its RSVPs.")
+    queryset = rsvp_export_queryset(event_id=event.id)
+    return stream_rsvps(queryset, request.GET.get('format', 'csv'), f'event-{event.id}-rsvps')
+
+@user_passes_test(is_organizer, login_url='no-permission')
+def export_organizer_rsvps(request):
+    queryset = rsvp_export_queryset(event__organizer=request.user)
+    return stream_rsvps(queryset, request.GET.get('format', 'csv'), f'organizer-{request.user.id}-rsvps')
 
 # Create / Update Event
 @user_passes_test(is_organizer, login_url='no-permission')
@@ -115,17 +189,39 @@ def event_form(request, event_id=None):
     categories = Category.objects.all()
     return render(request, 'events/event_form.html', {'event': event, 'categories': categories})
 
+def rsvp_context(user, event_id):
+    """Whether to offer the RSVP / cancel buttons on the event page, and which."""
+    if not is_participant(user):
+        return {'can_rsvp': False}
+    return {'can_rsvp': True, 'rsvp_status': rsvp_service.rsvp_status(user, event_id)}
+
 # RSVP to Event
+@require_POST
 @user_passes_test(is_participant, login_url='no-permission')
 def rsvp_event(request, event_id):
-    event = get_object_or_404(Event, id=event_id)
-    rsvp, created = RSVP.objects.get_or_create(user=request.user, event=event)
-    if created:
+    event = get_object_or_404(Event.objects.only('id', 'name'), id=event_id)
+    status = rsvp_service.reserve_seat(request.user, event.id)
+    if status == rsvp_service.RSVPED:
         messages.success(request, f"RSVP successful for {event.name}")
+    elif status == rsvp_service.WAITLISTED:
+        messages.info(request, f"{event.name} is full. You have been added to the waitlist.")
+    elif status == rsvp_service.ALREADY_WAITLISTED:
+        messages.info(request, f"You are already on the waitlist for {event.name}")
     else:
         messages.info(request, f"You already RSVPed to {event.name}")
     return redirect('participant-dashboard')
 
+# Cancel RSVP (or leave the waitlist)
+@require_POST
+@user_passes_test(is_participant, login_url='no-permission')
+def cancel_rsvp(request, event_id):
+    event = get_object_or_404(Event.objects.only('id', 'name'), id=event_id)
+    if rsvp_service.cancel_rsvp(request.user, event.id):
+        messages.success(request, f"Your RSVP for {event.name} was cancelled")
+    else:
+        messages.info(request, f"You had not RSVPed to {event.name}")
+    return redirect('participant-dashboard')
+
 
 #Event Delete
 @login_required
@@ -169,13 +265,6 @@ def create_event(request):
         form = EventForm()
     
     return render(request, "event_create.html", {"form": form})
-# --- Event CRUD ---
-@login_required
-def event_list(request):
-    events = Event.objects.select_related("category", "organizer").all()
-    return render(request, "events/event_list.html", {"events": events})
-
-
 ###########Category
 from .models import Category
 from .forms import CategoryForm
@@ -235,7 +324,7 @@ def category_delete(request, pk):
 # ----------------------------
 class EventListView(LoginRequiredMixin, ListView):
     model = Event
-    template_name = 'events/event_list.html'
+    template_name = 'event_list.html'
     context_object_name = 'events'
 
     def get_queryset(self):
@@ -245,9 +334,16 @@ class EventListView(LoginRequiredMixin, ListView):
         if category_id:
             queryset = queryset.filter(category_id=category_id)
         if search:
-            queryset = queryset.filter(name__icontains=search)
+            queryset = search_events(queryset, search)
         return queryset
 
+    def get_context_data(self, **kwargs):
+        keys = SEARCH_KEYS if self.request.GET.get('search') else EVENT_KEYS
+        page = paginate_cursor(self.object_list, self.request, keys=keys)
+        context = super().get_context_data(object_list=page.object_list, **kwargs)
+        context['page'] = page
+        return context
+
 
 # ----------------------------
 # Category List (CBV)
@@ -335,4 +431,121 @@ def category_update(request, pk):
         else:
             messages.error(request, "Category name cannot be empty.")
 
-    return render(request, 'events/category_form.html', {'category': category})
\ No newline at end of file
+    return render(request, 'events/category_form.html', {'category': category})
+
+# ----------------------------
+# Async versions of the read-heavy pages (routed when settings.ASYNC_VIEWS is on)
+# ----------------------------
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from .pagination import apaginate_cursor
+
+# Templates may still touch the session or role cache, so render off the event loop.
+arender = sync_to_async(render)
+
+
+@user_passes_test(is_organizer, login_url='no-permission')
+async def aorganizer_dashboard(request):
+    user = await request.auser()
+    events = [
+        event async for event in Event.objects.filter(organizer=user)
+        .select_related('category', 'organizer').order_by('start_at', 'id').aiterator()
+    ]
+    stats = await sync_to_async(get_organizer_stats)(user.id)
+    context = {
+        'events': events,
+        'live_stream_url': organizer_stream_url(events),
+        'total_events': stats['total'],
+        'upcoming_events': stats['upcoming'],
+        'past_events': stats['past'],
+        'total_participants': stats['participants'],
+        'today_events': stats['today'],
+    }
+    return await arender(request, 'dashboard/organizer_dashboard.html', context)
+
+
+@user_passes_test(is_participant, login_url='no-permission')
+async def aparticipant_dashboard(request):
+    user = await request.auser()
+    tab = participant_tab(request)
+    events, keys = participant_events(user, tab)
+    page = await apaginate_cursor(events, request, keys=keys)
+    context = {
+        'tab': tab,
+        'events': page.object_list,
+        'page': page,
+        'counts': await sync_to_async(get_participant_stats)(user.id),
+    }
+    return await arender(request, 'dashboard/participant_dashboard.html', context)
+
+
+@login_required
+async def aevent_list(request):
+    events = Event.objects.select_related('category')
+    category_id = request.GET.get('category')
+    search = request.GET.get('search')
+    if category_id:
+        events = events.filter(category_id=category_id)
+    keys = EVENT_KEYS
+    if search:
+        events = search_events(events, search)
+        keys = SEARCH_KEYS
+    page = await apaginate_cursor(events, request, keys=keys)
+    return await arender(request, 'event_list.html', {'events': page.object_list, 'page': page})
+
+
+async def aevent_details(request, event_id):
+    try:
+        event = await Event.objects.select_related('organizer', 'category').only(
+            'id', 'name', 'description', 'date', 'time', 'image', 'image_variants',
+            'rsvp_count', 'capacity', 'organizer__username', 'category__name',
+        ).aget(id=event_id)
+    except Event.DoesNotExist:
+        raise Http404("No Event matches the given query.")
+    attendees = (
+        RSVP.objects.filter(event_id=event.id)
+        .select_related('user')
+        .only('id', 'rsvp_date', 'user__first_name', 'user__last_name', 'user__email')
+    )
+    page = await apaginate_cursor(
+        attendees, request, keys=('rsvp_date', 'id'), page_size=settings.ATTENDEES_PAGE_SIZE
+    )
+    return await arender(request, "event_details.html", {
+        "event": event, "attendees": page.object_list, "page": page, "live_rsvp_counts": settings.LIVE_RSVP_COUNTS,
+        **await sync_to_async(rsvp_context)(request.user, event.id),
+    })
+
+
+# ----------------------------
+# Live RSVP counts (server-sent events)
+# ----------------------------
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from . import live
+
+
+def _rsvp_count_response(request, event_ids, filters=None):
+    # Under WSGI each open stream would pin a worker thread; 204 tells
+    # EventSource to stop reconnecting.
+    if not settings.LIVE_RSVP_COUNTS or not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    response = StreamingHttpResponse(live.rsvp_count_stream(event_ids, filters), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+async def event_rsvp_stream(request, event_id):
+    if not await Event.objects.filter(id=event_id).aexists():
+        raise Http404("No Event matches the given query.")
+    return _rsvp_count_response(request, [event_id])
+
+
+@user_passes_test(is_organizer, login_url='no-permission')
+async def organizer_rsvp_stream(request):
+    """Counts of the dashboard's events, passed as ``?events=1,2,3``."""
+    user = await request.auser()
+    event_ids = [int(value) for value in request.GET.get('events', '').split(',') if value.isdigit()]
+    return _rsvp_count_response(
+        request, event_ids[:settings.LIVE_RSVP_MAX_EVENTS], {'organizer_id': user.id}
+    )
@@ -0,0 +1,83 @@
+"""
+Short-lived cache of the authenticated ``User`` per session.
+
+Django loads the user with a query on every authenticated request. Here the
+loaded user is kept in the cache under the session key plus a per-user
+version, so a warm request costs two cache reads instead. The version is
+bumped once a save or delete of the user commits (see users.signals), and the
+entry for a session is dropped on logout. The session's auth hash is still
+checked against the cached user, so a password change on another device
+logs this session out just as it would without the cache.
+"""
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.crypto import constant_time_compare
+
+from core.caching import bump_versions, get_version
+from core.metrics import record_cache
+
+
+# ----------------------------
+# Versioned keys
+# ----------------------------
+def _version_key(user_id):
+    return f'auth-user-version:{user_id}'
+
+
+def _version(user_id):
+    return get_version(_version_key(user_id))
+
+
+def _user_key(session_key, user_id):
+    return f'auth-user:{session_key}:{user_id}:{_version(user_id)}'
+
+
+def invalidate_user(*user_ids):
+    """Orphan every cached copy of these users, across all their sessions."""
+    bump_versions(*(_version_key(user_id) for user_id in user_ids))
+
+
+def invalidate_user_on_commit(*user_ids):
+    """invalidate_user() once the current transaction commits, so the old row cannot be re-cached."""
+    if user_ids:
+        transaction.on_commit(lambda: invalidate_user(*user_ids))
+
+
+def forget_session(session_key, user_id):
+    if session_key:
+        cache.delete(_user_key(session_key, user_id))
+
+
+# ----------------------------
+# Lookup
+# ----------------------------
+def _session_matches(session, user):
+    # The same checks django.contrib.auth.get_user() makes on a freshly loaded user.
+    if str(user.pk) != str(session.get(SESSION_KEY)):
+        return False
+    if session.get(BACKEND_SESSION_KEY) not in settings.AUTHENTICATION_BACKENDS:
+        return False
+    session_hash = session.get(HASH_SESSION_KEY)
+    return bool(session_hash) and constant_time_compare(session_hash, user.get_session_auth_hash())
+
+
+def get_user(request):
+    """Drop-in replacement for ``django.contrib.auth.get_user`` backed by the cache."""
+    session = request.session
+    user_id = session.get(SESSION_KEY)
+    if not settings.USER_CACHE_TTL or user_id is None or not session.session_key:
+        return auth.get_user(request)
+
+    key = _user_key(session.session_key, user_id)
+    user = cache.get(key)
+    record_cache('auth-user', user is not None)
+    if user is not None and _session_matches(session, user):
+        return user
+
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        cache.set(key, user, settings.USER_CACHE_TTL)
+    return user
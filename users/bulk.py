@@ -0,0 +1,70 @@
+"""
+Role changes and activation for many users at once.
+
+``assign_role`` and ``activate_user`` go through ``user.groups`` and
+``user.save()`` one user at a time, firing every signal handler per user.
+These functions instead work on batches of ``BATCH_SIZE`` users with a
+handful of set-based statements each, and do by hand what those handlers
+would have done: refresh the directory entries, adjust the PlatformStats
+role counters and, once each batch commits, invalidate the role and
+authenticated-user caches.
+"""
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count
+
+from core.models import PlatformStats
+
+from .auth_cache import invalidate_user_on_commit
+from .directory import BATCH_SIZE
+from .models import DirectoryEntry
+from .roles import invalidate_roles_on_commit
+
+Membership = User.groups.through
+
+
+def _batches(user_ids):
+    user_ids = list(user_ids)
+    for start in range(0, len(user_ids), BATCH_SIZE):
+        yield user_ids[start:start + BATCH_SIZE]
+
+
+def bulk_assign_role(user_ids, group):
+    """
+    Make ``group`` the only group of every user in ``user_ids``, as
+    ``assign_role`` does for one user. Returns (memberships added, removed).
+    """
+    added = removed = 0
+    for batch in _batches(user_ids):
+        with transaction.atomic():
+            others = Membership.objects.filter(user_id__in=batch).exclude(group_id=group.id)
+            removed_by_group = dict(
+                others.values_list('group__name').annotate(n=Count('id')).order_by()
+            )
+            others.delete()
+            members = set(
+                Membership.objects.filter(user_id__in=batch, group_id=group.id).values_list('user_id', flat=True)
+            )
+            new = [Membership(user_id=user_id, group_id=group.id) for user_id in batch if user_id not in members]
+            Membership.objects.bulk_create(new)
+            DirectoryEntry.objects.filter(user_id__in=batch).update(role=group.name)
+
+            changes = {name: -count for name, count in removed_by_group.items()}
+            changes[group.name] = len(new)
+            PlatformStats.bump_roles(changes)
+            invalidate_roles_on_commit(*batch)
+        added += len(new)
+        removed += sum(removed_by_group.values())
+    return added, removed
+
+
+def bulk_set_active(user_ids, active=True):
+    """Activate (or deactivate) every user in ``user_ids``. Returns how many changed."""
+    changed = 0
+    for batch in _batches(user_ids):
+        with transaction.atomic():
+            changed += User.objects.filter(id__in=batch).exclude(is_active=active).update(is_active=active)
+            DirectoryEntry.objects.filter(user_id__in=batch).update(is_active=active)
+            # Deactivated users must not be served from the cache once this commits.
+            invalidate_user_on_commit(*batch)
+    return changed
@@ -1,12 +1,13 @@
 from django.http import HttpResponseRedirect
 from django.urls import reverse
+from users.roles import has_role
 
 def group_required(group_name):
     def decorator(view_func):
         def _wrapped_view(request, *args, **kwargs):
             if not request.user.is_authenticated:
                 return HttpResponseRedirect(reverse('login'))
-            if not request.user.groups.filter(name=group_name).exists():
+            if not has_role(request.user, group_name):
                 return HttpResponseRedirect(reverse('no-permission'))
             return view_func(request, *args, **kwargs)
         return _wrapped_view
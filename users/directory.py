@@ -0,0 +1,93 @@
+"""
+Admin user directory.
+
+The directory pages through ``DirectoryEntry`` rather than ``auth_user`` plus
+its groups, so a search, role or status filter is answered from one table
+and its indexes however many accounts there are. ``sync_directory`` rewrites
+the entries of a few users and is called from users.signals whenever a user
+or their groups change; ``rebuild_directory`` redoes every entry in batches,
+for data written without signals (bulk inserts, raw SQL).
+"""
+from collections import defaultdict
+
+from django.contrib.auth.models import User
+from django.db.models import Q
+
+from .models import DirectoryEntry
+from .roles import ADMIN, ORGANIZER, PARTICIPANT
+
+ROLE_PRECEDENCE = (ADMIN, ORGANIZER, PARTICIPANT)
+NO_ROLE = 'none'
+
+DIRECTORY_KEYS = ('username', 'user_id')
+
+
+def primary_role(group_names):
+    """The highest built-in role among ``group_names``, else the first other group, else ''."""
+    for role in ROLE_PRECEDENCE:
+        if role in group_names:
+            return role
+    return min(group_names, default='')
+
+
+# ----------------------------
+# Sync
+# ----------------------------
+BATCH_SIZE = 5000
+
+
+def sync_directory(*user_ids):
+    """Rewrite the directory entries of these users from User and their groups."""
+    for start in range(0, len(user_ids), BATCH_SIZE):
+        _sync_batch(user_ids[start:start + BATCH_SIZE])
+
+
+def _sync_batch(user_ids):
+    groups = defaultdict(set)
+    memberships = User.groups.through.objects.filter(user_id__in=user_ids).values_list('user_id', 'group__name')
+    for user_id, name in memberships:
+        groups[user_id].add(name)
+    entries = [
+        DirectoryEntry(
+            user_id=user_id, username=username.lower(), email=email.lower(),
+            role=primary_role(groups[user_id]), is_active=is_active,
+        )
+        for user_id, username, email, is_active in
+        User.objects.filter(id__in=user_ids).values_list('id', 'username', 'email', 'is_active')
+    ]
+    DirectoryEntry.objects.bulk_create(
+        entries, update_conflicts=True, unique_fields=['user'],
+        update_fields=['username', 'email', 'role', 'is_active'],
+    )
+
+
+def rebuild_directory():
+    last_id = 0
+    while True:
+        ids = list(User.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:BATCH_SIZE])
+        if not ids:
+            return
+        _sync_batch(ids)
+        last_id = ids[-1]
+
+
+# ----------------------------
+# Search
+# ----------------------------
+def search_directory(query='', role='', active=None):
+    """
+    Directory entries whose username or email starts with ``query``
+    (case-insensitively), optionally with one role (``NO_ROLE`` for users
+    without any group) and one active status.
+    """
+    entries = DirectoryEntry.objects.select_related('user').only(
+        'user_id', 'username', 'role', 'is_active', 'user__username', 'user__email',
+    )
+    query = query.strip().lower()
+    if query:
+        entries = entries.filter(Q(username__startswith=query) | Q(email__startswith=query))
+    if role:
+        entries = entries.filter(role='' if role == NO_ROLE else role)
+    if active is not None:
+        entries = entries.filter(is_active=active)
+    return entries
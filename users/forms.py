@@ -22,3 +22,34 @@ class CreateGroupForm(forms.ModelForm):
     class Meta:
         model = Group
         fields = ('name', 'permissions')
+
+
+class BulkUserActionForm(forms.Form):
+    """Admin directory bulk action, applied to the ticked users or to every user matching the filters."""
+    ASSIGN_ROLE = 'assign_role'
+    ACTIVATE = 'activate'
+    DEACTIVATE = 'deactivate'
+    SELECTED = 'selected'
+    MATCHING = 'matching'
+
+    action = forms.ChoiceField(choices=[
+        (ASSIGN_ROLE, 'Assign role'),
+        (ACTIVATE, 'Activate'),
+        (DEACTIVATE, 'Deactivate'),
+    ])
+    role = forms.ModelChoiceField(queryset=Group.objects.all(), to_field_name='name', required=False)
+    scope = forms.ChoiceField(choices=[(SELECTED, 'Selected users'), (MATCHING, 'All matching users')])
+    # Only the ticked ids are looked up; the field is never rendered.
+    users = forms.ModelMultipleChoiceField(queryset=User.objects.all(), required=False)
+    # The directory filters the page was showing.
+    q = forms.CharField(required=False)
+    filter_role = forms.CharField(required=False)
+    filter_active = forms.CharField(required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get('action') == self.ASSIGN_ROLE and not cleaned_data.get('role'):
+            self.add_error('role', "Choose the role to assign.")
+        if cleaned_data.get('scope') == self.SELECTED and not cleaned_data.get('users'):
+            self.add_error('users', "Select at least one user.")
+        return cleaned_data
@@ -0,0 +1,73 @@
+from pathlib import Path
+
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from users.bulk import bulk_assign_role, bulk_set_active
+from users.directory import BATCH_SIZE, NO_ROLE, search_directory
+
+STATUSES = {'active': True, 'inactive': False}
+
+
+class Command(BaseCommand):
+    help = (
+        "Assign a role to, activate or deactivate every user matching the filters, "
+        "in batches of set-based queries. Example after an import: "
+        "bulk_users --file attendees.txt --assign-role Organizer --activate"
+    )
+
+    def add_arguments(self, parser):
+        filters = parser.add_argument_group('filters (combined with AND)')
+        filters.add_argument('--search', default='', help="Username or email prefix.")
+        filters.add_argument('--role', default='', help=f"Current primary role; '{NO_ROLE}' for users without one.")
+        filters.add_argument('--status', choices=sorted(STATUSES))
+        filters.add_argument('--file', help="File with one username or email per line.")
+
+        actions = parser.add_argument_group('actions')
+        actions.add_argument('--assign-role', help="Group name to make each user's only group.")
+        status = actions.add_mutually_exclusive_group()
+        status.add_argument('--activate', action='store_true')
+        status.add_argument('--deactivate', action='store_true')
+        parser.add_argument('--dry-run', action='store_true', help="Only report how many users match.")
+
+    def handle(self, *args, **options):
+        if not (options['assign_role'] or options['activate'] or options['deactivate']):
+            raise CommandError("Nothing to do: pass --assign-role, --activate or --deactivate.")
+        group = None
+        if options['assign_role']:
+            try:
+                group = Group.objects.get(name=options['assign_role'])
+            except Group.DoesNotExist:
+                raise CommandError(f"No group named {options['assign_role']!r}.")
+
+        user_ids = self.matching_user_ids(options)
+        self.stdout.write(f"{len(user_ids)} users match.")
+        if options['dry_run'] or not user_ids:
+            return
+
+        if group:
+            added, removed = bulk_assign_role(user_ids, group)
+            self.stdout.write(f"Assigned {group.name}: {added} memberships added, {removed} removed.")
+        if options['activate'] or options['deactivate']:
+            changed = bulk_set_active(user_ids, active=options['activate'])
+            self.stdout.write(f"{'Activated' if options['activate'] else 'Deactivated'} {changed} users.")
+        self.stdout.write(self.style.SUCCESS("Done."))
+
+    def matching_user_ids(self, options):
+        entries = search_directory(options['search'], options['role'], STATUSES.get(options['status']))
+        if not options['file']:
+            return list(entries.order_by('user_id').values_list('user_id', flat=True))
+
+        path = Path(options['file'])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist.")
+        # Directory entries store usernames and emails lowercased.
+        identifiers = sorted({line.strip().lower() for line in path.read_text().splitlines() if line.strip()})
+        user_ids = set()
+        for start in range(0, len(identifiers), BATCH_SIZE):
+            batch = identifiers[start:start + BATCH_SIZE]
+            user_ids.update(
+                entries.filter(Q(username__in=batch) | Q(email__in=batch)).values_list('user_id', flat=True)
+            )
+        return sorted(user_ids)
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver queued emails from the outbox, retrying failures with exponential backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--max-attempts', type=int, default=5)
+        parser.add_argument('--loop', action='store_true', help="Keep polling instead of exiting when the outbox is empty.")
+        parser.add_argument('--interval', type=float, default=5.0, help="Seconds to sleep between empty polls.")
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = drain_outbox(options['batch_size'], options['max_attempts'])
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}")
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(f"Done. Sent {total_sent}, failed {total_failed}."))
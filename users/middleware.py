@@ -0,0 +1,29 @@
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.utils.functional import SimpleLazyObject
+
+from users import auth_cache
+
+
+def get_user(request):
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = auth_cache.get_user(request)
+    return request._cached_user
+
+
+async def auser(request):
+    if not hasattr(request, '_acached_user'):
+        # Shared with request.user, so templates rendered later need no lookup.
+        request._acached_user = await sync_to_async(get_user)(request)
+    return request._acached_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware that serves ``request.user`` from users.auth_cache."""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_user(request))
+        request.auser = partial(auser, request)
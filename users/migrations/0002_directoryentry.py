@@ -0,0 +1,68 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 5000
+# Frozen copy of users.directory's role precedence as of this migration.
+ROLE_PRECEDENCE = ('Admin', 'Organizer', 'Participant')
+
+
+def primary_role(group_names):
+    for role in ROLE_PRECEDENCE:
+        if role in group_names:
+            return role
+    return min(group_names, default='')
+
+
+def backfill_directory(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    DirectoryEntry = apps.get_model('users', 'DirectoryEntry')
+    last_id = 0
+    while True:
+        users = list(
+            User.objects.filter(id__gt=last_id).order_by('id')
+            .values_list('id', 'username', 'email', 'is_active')[:BATCH_SIZE]
+        )
+        if not users:
+            break
+        groups = {}
+        memberships = User.groups.through.objects.filter(
+            user_id__in=[user[0] for user in users]
+        ).values_list('user_id', 'group__name')
+        for user_id, name in memberships:
+            groups.setdefault(user_id, set()).add(name)
+        DirectoryEntry.objects.bulk_create([
+            DirectoryEntry(
+                user_id=user_id, username=username.lower(), email=email.lower(),
+                role=primary_role(groups.get(user_id, set())), is_active=is_active,
+            )
+            for user_id, username, email, is_active in users
+        ])
+        last_id = users[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0001_outboundemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DirectoryEntry',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='directory_entry', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('username', models.CharField(max_length=150)),
+                ('email', models.CharField(blank=True, max_length=254)),
+                ('role', models.CharField(blank=True, max_length=150)),
+                ('is_active', models.BooleanField(default=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['username', 'user'], name='directory_username_idx'), models.Index(fields=['role', 'username', 'user'], name='directory_role_username_idx'), models.Index(fields=['username'], name='directory_username_like_idx', opclasses=['varchar_pattern_ops']), models.Index(fields=['email'], name='directory_email_like_idx', opclasses=['varchar_pattern_ops'])],
+            },
+        ),
+        migrations.RunPython(backfill_directory, migrations.RunPython.noop),
+    ]
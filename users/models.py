@@ -1,3 +1,66 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class OutboundEmail(models.Model):
+    """
+    Transactional outbox row. Written in the same transaction as whatever
+    triggered the mail and delivered later by ``manage.py send_outbox``.
+    """
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
+
+
+class DirectoryEntry(models.Model):
+    """
+    Denormalized copy of what the admin user directory searches, filters and
+    sorts on, one row per User. ``role`` is the user's primary group (see
+    users.directory.primary_role). Kept in sync by users.signals; username
+    and email are stored lowercased for case-insensitive prefix search.
+    """
+    user = models.OneToOneField(
+        'auth.User', on_delete=models.CASCADE, primary_key=True, related_name='directory_entry'
+    )
+    username = models.CharField(max_length=150)
+    email = models.CharField(max_length=254, blank=True)
+    role = models.CharField(max_length=150, blank=True)
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        indexes = [
+            # Keyset ordering of the directory, unfiltered and per role.
+            models.Index(fields=['username', 'user'], name='directory_username_idx'),
+            models.Index(fields=['role', 'username', 'user'], name='directory_role_username_idx'),
+            # Prefix (LIKE 'abc%') search; the opclasses only matter on PostgreSQL.
+            models.Index(fields=['username'], name='directory_username_like_idx',
+                         opclasses=['varchar_pattern_ops']),
+            models.Index(fields=['email'], name='directory_email_like_idx', opclasses=['varchar_pattern_ops']),
+        ]
+
+    def __str__(self):
+        return f"{self.username} ({self.role or 'no role'})"
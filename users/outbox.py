@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import OutboundEmail
+
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 60 * 60
+# Added to every lease on top of the per-message email timeout.
+LEASE_MARGIN_SECONDS = 60
+
+UPDATE_FIELDS = ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at']
+
+
+def enqueue_email(subject, body, to, from_email=None):
+    """Queue a message; call inside the transaction that makes it necessary."""
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(to),
+    )
+
+
+def _backoff(attempts):
+    return timedelta(seconds=min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS))
+
+
+def _record_failure(message, error, max_attempts):
+    message.attempts += 1
+    message.last_error = str(error)
+    if message.attempts >= max_attempts:
+        message.status = OutboundEmail.FAILED
+    else:
+        message.next_attempt_at = timezone.now() + _backoff(message.attempts)
+
+
+def _lease(size):
+    # Long enough to try every message of the batch even if each one times out.
+    timeout = getattr(settings, 'EMAIL_TIMEOUT', None) or 60
+    return timedelta(seconds=LEASE_MARGIN_SECONDS + 2 * timeout * size)
+
+
+def _claim(batch_size):
+    """
+    Lease up to ``batch_size`` due messages to this worker by pushing their
+    next_attempt_at past the time it needs to send them, and return them.
+
+    Rows are locked with SELECT ... FOR UPDATE SKIP LOCKED where the database
+    supports it, but only for this short transaction. If the worker dies,
+    the lease runs out and another worker picks the messages up again.
+    """
+    with transaction.atomic():
+        batch = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboundEmail.PENDING, next_attempt_at__lte=timezone.now())
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if batch:
+            leased_until = timezone.now() + _lease(len(batch))
+            OutboundEmail.objects.filter(pk__in=[message.pk for message in batch]).update(
+                next_attempt_at=leased_until
+            )
+    return batch
+
+
+def drain_outbox(batch_size=100, max_attempts=5):
+    """
+    Deliver one batch of due messages over a single backend connection.
+
+    The batch is claimed in its own short transaction and delivered outside
+    it, so a slow mail server never holds row locks; several workers can
+    drain the same table. Each outcome is saved as soon as it is known.
+    Returns a ``(sent, failed)`` tuple for the batch.
+    """
+    sent = failed = 0
+    batch = _claim(batch_size)
+    if not batch:
+        return sent, failed
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        # SMTP is down: back off the whole batch without trying each message.
+        for message in batch:
+            _record_failure(message, e, max_attempts)
+        OutboundEmail.objects.bulk_update(batch, UPDATE_FIELDS)
+        return sent, len(batch)
+
+    try:
+        for message in batch:
+            try:
+                EmailMessage(
+                    message.subject, message.body, message.from_email, message.to,
+                    connection=connection,
+                ).send()
+            except Exception as e:
+                _record_failure(message, e, max_attempts)
+                failed += 1
+            else:
+                message.attempts += 1
+                message.status = OutboundEmail.SENT
+                message.sent_at = timezone.now()
+                message.last_error = ''
+                sent += 1
+            message.save(update_fields=UPDATE_FIELDS)
+    finally:
+        connection.close()
+    return sent, failed
@@ -0,0 +1,67 @@
+from django.core.cache import cache
+from django.db import transaction
+
+from core.caching import bump_versions, get_version
+from core.metrics import record_cache
+
+ADMIN = 'Admin'
+ORGANIZER = 'Organizer'
+PARTICIPANT = 'Participant'
+
+ROLE_CACHE_TTL = 60 * 60
+
+
+# ----------------------------
+# Versioned shared cache
+# ----------------------------
+def _version_key(user_id):
+    return f'user-roles-version:{user_id}'
+
+
+def _version(user_id):
+    return get_version(_version_key(user_id))
+
+
+def invalidate_roles(*user_ids):
+    """Give each user a fresh version so every cached role set for them is orphaned."""
+    bump_versions(*(_version_key(user_id) for user_id in user_ids))
+
+
+def invalidate_roles_on_commit(*user_ids):
+    """
+    invalidate_roles() once the current transaction commits. Bumping the
+    version earlier would let a concurrent request cache the old groups
+    under the new version until ROLE_CACHE_TTL runs out.
+    """
+    if user_ids:
+        transaction.on_commit(lambda: invalidate_roles(*user_ids))
+
+
+# ----------------------------
+# Resolution
+# ----------------------------
+def get_role_names(user):
+    """
+    Return the user's group names as a frozenset.
+
+    Memoized on the user object for the rest of the request and kept in the
+    shared cache between requests, so role checks cost no queries once warm.
+    """
+    if not user.is_authenticated:
+        return frozenset()
+    names = getattr(user, '_role_names', None)
+    if names is not None:
+        return names
+
+    key = f'user-roles:{user.pk}:{_version(user.pk)}'
+    names = cache.get(key)
+    record_cache('roles', names is not None)
+    if names is None:
+        names = frozenset(user.groups.values_list('name', flat=True))
+        cache.set(key, names, ROLE_CACHE_TTL)
+    user._role_names = names
+    return names
+
+
+def has_role(user, *roles):
+    return not get_role_names(user).isdisjoint(roles)
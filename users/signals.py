@@ -1,9 +1,10 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, m2m_changed, pre_delete
 from django.contrib.auth.models import User, Group
 from django.dispatch import receiver
 from django.contrib.auth.tokens import default_token_generator
 from django.conf import settings
-from django.core.mail import send_mail
+from users.outbox import enqueue_email
+from users.roles import invalidate_roles_on_commit
 
 @receiver(post_save, sender=User)
 def send_activation_email(sender, instance, created, **kwargs):
@@ -21,11 +22,8 @@ Thank you!
 """
         recipient_list = [instance.email]
 
-        try:
-            send_mail(subject, message, settings.EMAIL_HOST_USER, recipient_list, fail_silently=False)
-            print(f"Activation email sent to {instance.email}")
-        except Exception as e:
-            print(f"Failed to send email to {instance.email}: {str(e)}")
+        # Queued in the signup transaction; delivered by `manage.py send_outbox`.
+        enqueue_email(subject, message, recipient_list, from_email=settings.EMAIL_HOST_USER)
 
 
 @receiver(post_save, sender=User)
@@ -33,3 +31,86 @@ def assign_default_role(sender, instance, created, **kwargs):
     if created and not instance.groups.exists():
         group, _ = Group.objects.get_or_create(name="Participant")
         instance.groups.add(group)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_cached_roles(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        # group.user_set.clear(): pk_set is None, so collect the members first.
+        invalidate_roles_on_commit(*instance.user_set.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        if not reverse:
+            invalidate_roles_on_commit(instance.pk)
+        elif pk_set:
+            invalidate_roles_on_commit(*pk_set)
+
+
+@receiver(pre_delete, sender=Group)
+def invalidate_roles_for_deleted_group(sender, instance, **kwargs):
+    invalidate_roles_on_commit(*instance.user_set.values_list('pk', flat=True))
+
+
+# ----------------------------
+# Cached authenticated user
+# ----------------------------
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_delete
+from users.auth_cache import forget_session, invalidate_user_on_commit
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Covers password changes too: set_password() is followed by save().
+    invalidate_user_on_commit(instance.pk)
+
+
+@receiver(user_logged_out)
+def forget_logged_out_session(sender, request, user, **kwargs):
+    if user is not None:
+        forget_session(request.session.session_key, user.pk)
+
+
+# ----------------------------
+# User directory
+# ----------------------------
+from django.db.models.signals import post_delete
+from users.directory import sync_directory
+
+DIRECTORY_FIELDS = {'username', 'email', 'is_active'}
+
+
+@receiver(post_save, sender=User)
+def sync_directory_for_user(sender, instance, update_fields=None, **kwargs):
+    # login() saves last_login alone on every sign-in; nothing to sync then.
+    if update_fields is None or DIRECTORY_FIELDS & set(update_fields):
+        sync_directory(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def sync_directory_for_groups(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        instance._directory_members = list(instance.user_set.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        if not reverse:
+            sync_directory(instance.pk)
+        elif action == 'post_clear':
+            sync_directory(*instance.__dict__.pop('_directory_members', ()))
+        elif pk_set:
+            sync_directory(*pk_set)
+
+
+@receiver(post_save, sender=Group)
+def sync_directory_for_renamed_group(sender, instance, created, **kwargs):
+    if not created:
+        sync_directory(*instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Group)
+def remember_group_members(sender, instance, **kwargs):
+    instance._directory_members = list(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Group)
+def sync_directory_for_deleted_group(sender, instance, **kwargs):
+    sync_directory(*getattr(instance, '_directory_members', ()))
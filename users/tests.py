@@ -1,3 +1,332 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import Group, User
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend as LocMemEmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import PlatformStats
+
+from .bulk import bulk_assign_role, bulk_set_active
+from .models import DirectoryEntry, OutboundEmail
+from .outbox import drain_outbox, enqueue_email
+from .roles import ORGANIZER, PARTICIPANT, get_role_names, has_role
+
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'auth-tests'}}
+
+
+class FlakyEmailBackend(LocMemEmailBackend):
+    """The locmem backend, refusing mail to any address in ``failing``."""
+    failing = set()
+    seen_due = []
+
+    def send_messages(self, messages):
+        # What another worker could claim while this batch is being delivered.
+        self.seen_due.append(
+            OutboundEmail.objects.filter(status=OutboundEmail.PENDING, next_attempt_at__lte=timezone.now()).count()
+        )
+        for message in messages:
+            if self.failing.intersection(message.to):
+                raise ConnectionError('relay refused the message')
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND='users.tests.FlakyEmailBackend')
+class OutboxTests(TestCase):
+    def setUp(self):
+        FlakyEmailBackend.failing = set()
+        FlakyEmailBackend.seen_due = []
+
+    def make_due(self, message):
+        OutboundEmail.objects.filter(pk=message.pk).update(next_attempt_at=timezone.now())
+
+    def test_delivers_due_messages_while_leasing_them(self):
+        first = enqueue_email('Welcome', 'Hi', ['a@example.com'])
+        enqueue_email('Welcome', 'Hi', ['b@example.com'])
+        self.assertEqual(drain_outbox(), (2, 0))
+        self.assertEqual([m.to for m in mail.outbox], [['a@example.com'], ['b@example.com']])
+        # Both rows were leased before the first message went out.
+        self.assertEqual(FlakyEmailBackend.seen_due, [0, 0])
+        first.refresh_from_db()
+        self.assertEqual((first.status, first.attempts, first.last_error), (OutboundEmail.SENT, 1, ''))
+        self.assertEqual(drain_outbox(), (0, 0))
+
+    def test_failure_is_retried_with_backoff(self):
+        FlakyEmailBackend.failing = {'a@example.com'}
+        message = enqueue_email('Welcome', 'Hi', ['a@example.com'])
+        self.assertEqual(drain_outbox(), (0, 1))
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), (OutboundEmail.PENDING, 1))
+        self.assertIn('relay refused', message.last_error)
+        self.assertAlmostEqual(
+            message.next_attempt_at - timezone.now(), timedelta(seconds=30), delta=timedelta(seconds=5),
+        )
+        # Not due again until the backoff has passed.
+        self.assertEqual(drain_outbox(), (0, 0))
+
+        self.make_due(message)
+        self.assertEqual(drain_outbox(), (0, 1))
+        message.refresh_from_db()
+        self.assertAlmostEqual(
+            message.next_attempt_at - timezone.now(), timedelta(seconds=60), delta=timedelta(seconds=5),
+        )
+
+        FlakyEmailBackend.failing = set()
+        self.make_due(message)
+        self.assertEqual(drain_outbox(), (1, 0))
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts, message.last_error), (OutboundEmail.SENT, 3, ''))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_gives_up_after_max_attempts(self):
+        FlakyEmailBackend.failing = {'a@example.com'}
+        message = enqueue_email('Welcome', 'Hi', ['a@example.com'])
+        enqueue_email('Welcome', 'Hi', ['b@example.com'])
+        self.assertEqual(drain_outbox(max_attempts=2), (1, 1))
+        self.make_due(message)
+        self.assertEqual(drain_outbox(max_attempts=2), (0, 1))
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), (OutboundEmail.FAILED, 2))
+        self.make_due(message)
+        self.assertEqual(drain_outbox(max_attempts=2), (0, 0))
+
+
+class CachedAuthTestsMixin:
+    """Session and user caching; run once per cache backend by the subclasses below."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='amina', email='amina@example.com')
+        self.user.set_password('pass1234')
+        self.user.save()
+        self.client.login(username='amina', password='pass1234')
+        self.url = reverse('participant-dashboard')
+
+    def get_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['user'].pk, self.user.pk)
+        return [q['sql'] for q in queries]
+
+    def test_warm_request_skips_session_and_user_queries(self):
+        self.get_queries()
+        warm = self.get_queries()
+        self.assertFalse([sql for sql in warm if 'django_session' in sql or 'FROM "auth_user"' in sql])
+
+    def test_saving_the_user_refreshes_the_cached_copy(self):
+        self.get_queries()
+        # A queryset update sends no signal, so the cached copy is still served...
+        User.objects.filter(pk=self.user.pk).update(first_name='Stale')
+        self.assertEqual(self.client.get(self.url).context['user'].first_name, '')
+        # ...until the user is saved.
+        self.user.first_name = 'Fresh'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertEqual(self.client.get(self.url).context['user'].first_name, 'Fresh')
+
+    def test_password_change_elsewhere_logs_the_session_out(self):
+        self.get_queries()
+        self.user.set_password('changed123')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_logout_drops_the_cached_user(self):
+        self.get_queries()
+        self.client.get(reverse('logout'))
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHE, SESSION_ENGINE='django.contrib.sessions.backends.cache', PASSWORD_HASHERS=FAST_HASHERS,
+)
+class LocMemCachedAuthTests(CachedAuthTestsMixin, TestCase):
+    pass
+
+
+class FileCachedAuthTests(CachedAuthTestsMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_dir = tempfile.mkdtemp()
+        cls.enterClassContext(override_settings(
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                                'LOCATION': cls.cache_dir}},
+            SESSION_ENGINE='django.contrib.sessions.backends.cached_db',
+            PASSWORD_HASHERS=FAST_HASHERS,
+        ))
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(cls.cache_dir, ignore_errors=True)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class RoleCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizers = Group.objects.get_or_create(name=ORGANIZER)[0]
+        self.user = User.objects.create(username='alice')
+
+    def roles(self):
+        return get_role_names(User.objects.get(pk=self.user.pk))
+
+    def test_group_changes_invalidate_only_once_committed(self):
+        self.assertEqual(self.roles(), {PARTICIPANT})
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.user.groups.add(self.organizers)
+        # Until the change commits, readers keep the cached (still committed) roles.
+        self.assertEqual(self.roles(), {PARTICIPANT})
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.roles(), {PARTICIPANT, ORGANIZER})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.organizers.user_set.clear()
+        self.assertEqual(self.roles(), {PARTICIPANT})
+
+    def test_deleting_a_group_invalidates_its_members(self):
+        self.user.groups.add(self.organizers)
+        self.assertIn(ORGANIZER, self.roles())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.organizers.delete()
+        self.assertEqual(self.roles(), {PARTICIPANT})
+
+
+@override_settings(CACHES=LOCMEM_CACHE, PASSWORD_HASHERS=FAST_HASHERS, USERS_PAGE_SIZE=2)
+class UserDirectoryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create(username='Root', email='root@example.com')
+        self.admin.groups.set([Group.objects.get_or_create(name='Admin')[0]])
+        self.client.force_login(self.admin)
+        organizers = Group.objects.get_or_create(name='Organizer')[0]
+        self.alice = User.objects.create(username='Alice', email='alice@example.com')
+        self.alice.groups.add(organizers)
+        self.alfred = User.objects.create(username='alfred', email='fred@example.org', is_active=False)
+        self.bob = User.objects.create(username='bob', email='ALBERT@example.net')
+
+    def usernames(self, query=''):
+        response = self.client.get(reverse('user-list') + query)
+        self.assertEqual(response.status_code, 200)
+        return [entry.user.username for entry in response.context['entries']], response
+
+    def test_prefix_search_matches_username_or_email_case_insensitively(self):
+        first, response = self.usernames('?q=AL')
+        self.assertEqual(first, ['alfred', 'Alice'])
+        self.assertEqual(self.usernames('?' + response.context['page'].next_query)[0], ['bob'])
+
+    def test_role_and_status_filters(self):
+        self.assertEqual(self.usernames('?role=Organizer')[0], ['Alice'])
+        self.assertEqual(self.usernames('?active=0')[0], ['alfred'])
+        self.assertEqual(self.usernames('?role=Participant&active=1')[0], ['bob'])
+
+    def test_role_column_follows_group_changes(self):
+        self.alice.groups.clear()
+        self.assertEqual(self.usernames('?role=none')[0], ['Alice'])
+        admins = Group.objects.get(name='Admin')
+        admins.user_set.add(self.alice)
+        self.assertEqual(self.usernames('?role=Admin')[0], ['Alice', 'Root'])
+        organizers = Group.objects.get(name='Organizer')
+        organizers.user_set.add(self.bob)
+        self.assertEqual(self.usernames('?role=Organizer')[0], ['bob'])
+        organizers.user_set.clear()
+        self.assertEqual(self.usernames('?role=Participant&q=bob')[0], ['bob'])
+
+    def test_page_cost_does_not_grow_with_the_directory(self):
+        self.usernames()
+        for i in range(20):
+            User.objects.create(username=f'extra{i}')
+        with CaptureQueriesContext(connection) as queries:
+            self.usernames('?q=extra')
+        self.assertFalse([q['sql'] for q in queries if 'auth_user_groups' in q['sql']])
+
+
+@override_settings(CACHES=LOCMEM_CACHE, PASSWORD_HASHERS=FAST_HASHERS)
+class BulkUserTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        PlatformStats.rebuild()
+        self.organizers = Group.objects.get_or_create(name='Organizer')[0]
+        self.admin = User.objects.create(username='root')
+        self.admin.groups.set([Group.objects.get_or_create(name='Admin')[0]])
+        self.client.force_login(self.admin)
+        self.attendees = [
+            User.objects.create(username=f'conf{i}', email=f'conf{i}@example.com', is_active=False)
+            for i in range(6)
+        ]
+
+    def assertStatsConsistent(self):
+        stats = PlatformStats.current()
+        self.assertEqual(stats.total_organizers, User.objects.filter(groups__name='Organizer').count())
+        self.assertEqual(stats.total_participants, User.objects.filter(groups__name='Participant').count())
+
+    def test_assign_role_to_all_matching_users(self):
+        # Warm the role cache so the change has something to invalidate.
+        self.assertFalse(has_role(User.objects.get(pk=self.attendees[0].pk), ORGANIZER))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('user-bulk-update'), {
+                'action': 'assign_role', 'role': 'Organizer', 'scope': 'matching', 'q': 'conf',
+            })
+        self.assertRedirects(response, reverse('user-list') + '?q=conf&role=&active=')
+        for user in self.attendees:
+            user = User.objects.get(pk=user.pk)
+            self.assertEqual(list(user.groups.values_list('name', flat=True)), ['Organizer'])
+            self.assertTrue(has_role(user, ORGANIZER))
+            self.assertEqual(user.directory_entry.role, 'Organizer')
+        self.assertEqual(list(self.admin.groups.values_list('name', flat=True)), ['Admin'])
+        self.assertStatsConsistent()
+
+    def test_query_count_does_not_grow_with_the_number_of_users(self):
+        with CaptureQueriesContext(connection) as few:
+            bulk_assign_role([user.pk for user in self.attendees[:2]], self.organizers)
+        with CaptureQueriesContext(connection) as many:
+            bulk_assign_role([user.pk for user in self.attendees], self.organizers)
+        self.assertEqual(len(few), len(many))
+
+    def test_selected_users_only(self):
+        self.client.post(reverse('user-bulk-update'), {
+            'action': 'activate', 'scope': 'selected', 'users': [self.attendees[0].pk, self.attendees[1].pk],
+        })
+        self.assertEqual(
+            sorted(User.objects.filter(is_active=True, username__startswith='conf').values_list('username', flat=True)),
+            ['conf0', 'conf1'],
+        )
+
+    def test_command_activates_users_listed_in_a_file(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as listing:
+            listing.write('CONF1\nconf2@example.com\nnobody\n')
+        self.addCleanup(os.unlink, listing.name)
+        call_command('bulk_users', file=listing.name, activate=True, assign_role='Organizer', stdout=StringIO())
+        self.assertEqual(
+            sorted(User.objects.filter(is_active=True, groups=self.organizers).values_list('username', flat=True)),
+            ['conf1', 'conf2'],
+        )
+        self.assertTrue(DirectoryEntry.objects.get(user=self.attendees[1]).is_active)
+        self.assertStatsConsistent()
+
+    def test_deactivation_logs_cached_sessions_out(self):
+        self.attendees[0].is_active = True
+        self.attendees[0].set_password('pass1234')
+        self.attendees[0].save()
+        client = self.client_class()
+        client.login(username='conf0', password='pass1234')
+        url = reverse('participant-dashboard')
+        self.assertEqual(client.get(url).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_set_active([self.attendees[0].pk], active=False)
+        self.assertEqual(client.get(url).status_code, 302)
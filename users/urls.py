@@ -1,4 +1,5 @@
 # users/urls.py
+from django.conf import settings
 from django.urls import path
 from . import views
 from users.views import ProfileView
@@ -17,11 +18,13 @@ urlpatterns = [
     path('dashboard/', views.redirect_dashboard, name='dashboard'),
 
     # admin views (actual admin page is in users.views.admin_dashboard)
-    path('admin/dashboard/', views.admin_dashboard, name='admin-dashboard'),
+    path('admin/dashboard/', views.aadmin_dashboard if settings.ASYNC_VIEWS else views.admin_dashboard,
+         name='admin-dashboard'),
     path('admin/assign-role/<int:user_id>/', views.assign_role, name='assign-role'),
     path('admin/create-group/', views.create_group, name='create-group'),
     path('admin/groups/', views.group_list, name='group-list'),
     path('admin/users/', views.user_list, name='user-list'),
+    path('admin/users/bulk/', views.bulk_update_users, name='user-bulk-update'),
 
     # (optionally) categories listing via users admin area (if you prefer)
     # path('admin/categories/', views.category_list, name='category-list'),
@@ -1,3 +1,5 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required, user_passes_test
@@ -6,17 +8,22 @@ from django.contrib.auth.tokens import default_token_generator
 from django.utils.encoding import force_str
 from django.core.mail import send_mail
 from django.contrib import messages
-from django.db.models import Prefetch
+from django.db import transaction
 from django.http import HttpResponse
-from .forms import AssignRoleForm
+from django.urls import reverse
+from django.utils.http import urlencode
+from .forms import AssignRoleForm, BulkUserActionForm
+from .bulk import bulk_assign_role, bulk_set_active
+from .roles import has_role, ADMIN, ORGANIZER, PARTICIPANT
+from .directory import DIRECTORY_KEYS, NO_ROLE, ROLE_PRECEDENCE, search_directory
 from events.models import Category 
-from events.models import Event
-from django.utils.timezone import now
+from events.pagination import paginate_cursor
+from core.models import PlatformStats
 from django.views.generic import TemplateView
 
 
 def is_admin(user):
-    return user.is_superuser or user.groups.filter(name='Admin').exists()
+    return user.is_superuser or has_role(user, ADMIN)
 
 
 # Signup with Email Activation
@@ -39,14 +46,16 @@ def signup_view(request):
             messages.error(request, "Username already taken")
             return redirect('signup')
 
-        user = User.objects.create_user(
-            username=username,
-            email=email,
-            password=password,
-            first_name=first_name,
-            last_name=last_name,
-            is_active=False
-        )
+        # The activation email is queued by a post_save signal in this same transaction.
+        with transaction.atomic():
+            user = User.objects.create_user(
+                username=username,
+                email=email,
+                password=password,
+                first_name=first_name,
+                last_name=last_name,
+                is_active=False
+            )
         messages.success(request, "Account created. Please ask admin to activate your account.")
         return redirect('login')
 
@@ -89,30 +98,29 @@ def activate_user(request, user_id, token):
 
 @user_passes_test(is_admin, login_url='no-permission')
 def admin_dashboard(request):
-    users = User.objects.prefetch_related(
-        Prefetch('groups', queryset=Group.objects.all(), to_attr='all_groups')
-    ).all()
+    # Counters are maintained incrementally by core.signals.
+    stats = PlatformStats.current()
 
-    for user in users:
-        if user.all_groups:
-            user.group_name = user.all_groups[0].name
-        else:
-            user.group_name = "No Group Assigned"
+    context = {
+        "total_organizers": stats.total_organizers,
+        "total_events": stats.total_events,
+        "total_participants": stats.total_participants,
+        "total_past_events": stats.total_past_events,
+    }
+    return render(request, "admin/dashboard.html", context)
 
-     # === Stats ===
-    total_organizers = User.objects.filter(groups__name="Organizer").count()
-    total_participants = User.objects.filter(groups__name="Participant").count()
-    total_events = Event.objects.count()
-    total_past_events = Event.objects.filter(date__lt=now()).count()
 
+# Async version, routed when settings.ASYNC_VIEWS is on.
+@user_passes_test(is_admin, login_url='no-permission')
+async def aadmin_dashboard(request):
+    stats = await sync_to_async(PlatformStats.current)()
     context = {
-        "users": users,
-        "total_organizers": total_organizers,
-        "total_events": total_events,
-        "total_participants": total_participants,
-        "total_past_events": total_past_events,
+        "total_organizers": stats.total_organizers,
+        "total_events": stats.total_events,
+        "total_participants": stats.total_participants,
+        "total_past_events": stats.total_past_events,
     }
-    return render(request, "admin/dashboard.html", context)
+    return await sync_to_async(render)(request, "admin/dashboard.html", context)
 
 
 @user_passes_test(is_admin, login_url='login')
@@ -150,14 +158,61 @@ def group_list(request):
     groups = Group.objects.all().prefetch_related('permissions')
     return render(request, 'admin/group_list.html', {'groups': groups})
 
+# User directory: prefix search, role and status filters, keyset pages.
+ACTIVE_FILTERS = {'1': True, '0': False}
+
+
 @user_passes_test(is_admin, login_url='login')
 def user_list(request):
-    users = User.objects.prefetch_related(
-        Prefetch('groups', queryset=Group.objects.all(), to_attr='all_groups')
-    ).all()
-    for user in users:
-        user.group_name = user.all_groups[0].name if user.all_groups else "No Group Assigned"
-    return render(request, 'admin/user_list.html', {'users': users})
+    query = request.GET.get('q', '')
+    role = request.GET.get('role', '')
+    active = request.GET.get('active', '')
+    entries = search_directory(query, role, ACTIVE_FILTERS.get(active))
+    page = paginate_cursor(entries, request, keys=DIRECTORY_KEYS, page_size=settings.USERS_PAGE_SIZE)
+    context = {
+        'entries': page.object_list,
+        'page': page,
+        'query': query,
+        'role': role,
+        'active': active,
+        'roles': ROLE_PRECEDENCE,
+        'no_role': NO_ROLE,
+    }
+    return render(request, 'admin/user_list.html', context)
+
+
+@user_passes_test(is_admin, login_url='login')
+def bulk_update_users(request):
+    if request.method != 'POST':
+        return redirect('user-list')
+    form = BulkUserActionForm(request.POST)
+    filters = {
+        'q': request.POST.get('q', ''),
+        'role': request.POST.get('filter_role', ''),
+        'active': request.POST.get('filter_active', ''),
+    }
+    # Back to the directory page the action was taken from.
+    back = redirect(f"{reverse('user-list')}?{urlencode(filters)}")
+    if not form.is_valid():
+        for errors in form.errors.values():
+            messages.error(request, errors[0])
+        return back
+
+    data = form.cleaned_data
+    if data['scope'] == BulkUserActionForm.SELECTED:
+        user_ids = [user.id for user in data['users']]
+    else:
+        entries = search_directory(filters['q'], filters['role'], ACTIVE_FILTERS.get(filters['active']))
+        user_ids = entries.values_list('user_id', flat=True)
+
+    if data['action'] == BulkUserActionForm.ASSIGN_ROLE:
+        added, removed = bulk_assign_role(user_ids, data['role'])
+        messages.success(request, f"Assigned {data['role'].name}: {added} memberships added, {removed} removed.")
+    else:
+        active = data['action'] == BulkUserActionForm.ACTIVATE
+        changed = bulk_set_active(user_ids, active)
+        messages.success(request, f"{'Activated' if active else 'Deactivated'} {changed} users.")
+    return back
 
 
 @user_passes_test(is_admin, login_url='login')
@@ -171,9 +226,9 @@ def redirect_dashboard(request):
     user = request.user
     if is_admin(user):
         return redirect('admin-dashboard')
-    elif user.groups.filter(name='Organizer').exists():
+    elif has_role(user, ORGANIZER):
         return redirect('organizer-dashboard')
-    elif user.groups.filter(name='Participant').exists():
+    elif has_role(user, PARTICIPANT):
         return redirect('participant-dashboard')
     else:
         messages.info(request, "Please activate your account or ask admin to assign a role.")